@@ -16,6 +16,7 @@ import logging
 from read_config import read_config
 from typing import Dict, Any, List, Optional
 from email_notification import send_email
+from sqs_batch import send_message_batches
 
 # Initialize SQS client
 sqs = boto3.client('sqs')
@@ -34,6 +35,9 @@ DB_CONFIG = {
 EMAIL_SQS_QUEUE_URL = os.environ.get("EMAIL_SQS_QUEUE_URL")
 SQS_QUEUE_URL = os.environ.get("SQS_QUEUE_URL") # Lambda runtime queue
 FARGATE_SQS_QUEUE_URL = os.environ.get("FARGATE_SQS_QUEUE_URL") # Fargate runtime queue
+
+# Rows fetched from the streaming cursor and sent to SQS per page
+PAGE_SIZE = int(os.environ.get("CHECKER_PAGE_SIZE", 200))
  
 #email
 # convert email_recipient into list
@@ -42,6 +46,85 @@ if isinstance(email_recipient, str):
     email_recipient = email_recipient.split(';')
 
 
+def prepare_message(row: Dict[str, Any]) -> bool:
+    """
+    Turn an event row into an SQS message body in place.
+
+    Returns False when the venue has no scraper mapping.
+    """
+    # Convert datetime objects to strings for JSON serialization
+    for key, value in row.items():
+        if isinstance(value, datetime):
+            row[key] = value.strftime("%Y-%m-%d %H:%M:%S")
+
+    # Map venue to appropriate scraper and runtime
+    if 'venue_name' in row and row['venue_name'] in scrapers:
+        # Lambda runtime scraper
+        row['scraper_func_name'] = scrapers[row['venue_name']]
+        row['runtime'] = 'lambda'
+    elif 'venue_name' in row and row['venue_name'] in ui_scrapers:
+        # Fargate runtime scraper (for UI-based scrapers)
+        row['task_def'] = ui_scrapers[row['venue_name']]
+        row['runtime'] = 'fargate'
+    else:
+        # Skip events with unmapped venues
+        logging.warning(f"Venue name {row['venue_name']} not found in scraper mapping")
+        return False
+
+    # Add processing metadata
+    row['env'] = 'prod'
+    row['process_name'] = 'checker'
+    return True
+
+
+def process_page(connection, table_name: str, rows: List[Dict[str, Any]]) -> int:
+    """
+    Send one page of event rows to SQS and mark the sent ones in_sqs = 1.
+
+    The in_sqs re-check and the update each take a single statement per page.
+
+    Returns:
+        Number of events sent to SQS
+    """
+    candidates = {}
+    for row in rows:
+        if row['event_id'] not in candidates and prepare_message(row):
+            candidates[row['event_id']] = row
+    if not candidates:
+        return 0
+
+    with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+        # Check which events are still not in SQS to avoid duplicates
+        cursor.execute(
+            f"SELECT DISTINCT event_id FROM {table_name} WHERE event_id IN %s AND in_sqs = 0",
+            (list(candidates),)
+        )
+        pending = {result['event_id'] for result in cursor.fetchall()}
+
+        sent_ids = []
+        for runtime, queue_url in (('lambda', SQS_QUEUE_URL), ('fargate', FARGATE_SQS_QUEUE_URL)):
+            messages = [row for event_id, row in candidates.items() if event_id in pending and row['runtime'] == runtime]
+            if not messages:
+                continue
+            sent, failed = send_message_batches(sqs, queue_url, messages)
+            sent_ids.extend(messages[pos]['event_id'] for pos in sent)
+            print(f"Sent {len(sent)} events to {runtime} SQS, {len(failed)} failed")
+            for pos in failed:
+                print(f"Failed to send event {messages[pos]['event_id']} to SQS")
+
+        # Mark the page's sent events as in SQS in one statement; committing
+        # even an empty page gives the next page's check a fresh snapshot
+        try:
+            if sent_ids:
+                cursor.execute(f"UPDATE {table_name} SET in_sqs = 1 WHERE event_id IN %s", (sent_ids,))
+            connection.commit()
+        except pymysql.MySQLError as e:
+            print(f"Failed to mark events {sent_ids} as in SQS: {e}")
+            connection.rollback()
+
+    return len(sent_ids)
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler function.
@@ -71,10 +154,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     event_enddays = params['eventDatetimeRange'].get('end')
     email_subject = event['emailSubject']
     
-    # Initialize database connection
+    # Initialize database connections: one streams the event query, the other
+    # runs the per-page checks and updates (an unbuffered cursor blocks its connection)
     connection = None
+    stream_connection = None
     try:
         connection = pymysql.connect(**DB_CONFIG)
+        stream_connection = pymysql.connect(**DB_CONFIG)
         print("Connected to MySQL database")
     except pymysql.MySQLError as e:
         print(f"Database connection failed: {e}")
@@ -103,8 +189,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     AND in_sqs = %s
                 """
             cursor.execute(query, (event_range, status, is_Listed, is_being_processed, in_sqs))
-                
+            connection.commit()
 
+        with stream_connection.cursor(pymysql.cursors.SSDictCursor) as stream_cursor:
             if event_startdays == "":
                 # Query for events from event_end onwards (no start date)
                 event_end = (datetime.now() + timedelta(days=int(event_enddays))).strftime('%Y-%m-%d')
@@ -117,7 +204,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 AND event_datetime >= %s
                 """
                 
-                cursor.execute(query, (status, is_Listed, is_being_processed, in_sqs, event_end))
+                stream_cursor.execute(query, (status, is_Listed, is_being_processed, in_sqs, event_end))
             else:
                 # Query for events within date range
                 event_end = (datetime.now() + timedelta(days=int(event_enddays))).strftime('%Y-%m-%d')
@@ -130,75 +217,30 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 AND in_sqs = %s
                 AND event_datetime BETWEEN %s AND %s
                 """
-                cursor.execute(query, (status, is_Listed, is_being_processed, in_sqs, event_start, event_end))
-            
-            rows = cursor.fetchall()
-            print(f"Found {len(rows)} events")
+                stream_cursor.execute(query, (status, is_Listed, is_being_processed, in_sqs, event_start, event_end))
             
+            # Stream the result set in fixed-size pages so memory stays bounded
+            total_rows = 0
             events_sent_to_sqs = 0
-            
-            # Process each event row
-            for row in rows:
-                # Convert datetime objects to strings for JSON serialization
-                for key, value in row.items():
-                    if isinstance(value, datetime):
-                        row[key] = value.strftime("%Y-%m-%d %H:%M:%S")
-                
-                # Map venue to appropriate scraper and runtime
-                if 'venue_name' in row and row['venue_name'] in scrapers:
-                    # Lambda runtime scraper
-                    row['scraper_func_name'] = scrapers[row['venue_name']]
-                    row['runtime'] = 'lambda'
-                elif 'venue_name' in row and row['venue_name'] in ui_scrapers:
-                    # Fargate runtime scraper (for UI-based scrapers)
-                    row['task_def'] = ui_scrapers[row['venue_name']]
-                    row['runtime'] = 'fargate'
-                else:
-                    # Skip events with unmapped venues
-                    logging.warning(f"Venue name {row['venue_name']} not found in scraper mapping")
-                    continue
-                
-                # Add processing metadata
-                row['env'] = 'prod'
-                row['process_name'] = 'checker'
-                
-                # Check if event is already in SQS to avoid duplicates
-                cursor.execute(f"SELECT in_sqs FROM {table_name} WHERE event_id = %s", (row['event_id'],))
-                in_sqs_result = cursor.fetchone()
-                
-                # Only process events not already in SQS
-                if in_sqs_result and in_sqs_result['in_sqs'] == 0:
-                    try:
-                        # Send to appropriate SQS queue based on runtime
-                        queue_url = SQS_QUEUE_URL if row['runtime'] == 'lambda' else FARGATE_SQS_QUEUE_URL
-                        response = sqs.send_message(
-                            QueueUrl=queue_url,
-                            MessageBody=json.dumps(row)
-                        )
-                        
-                        # Mark event as sent to SQS in database
-                        update_query = f"UPDATE {table_name} SET in_sqs = 1 WHERE event_id = %s"
-                        cursor.execute(update_query, (row['event_id'],))
-                        connection.commit()
-                        
-                        print(f"Updated event {row['event_id']} and sent to {row['runtime']} SQS: {response['MessageId']}")
-                        events_sent_to_sqs += 1
-                        
-                    except Exception as e:
-                        print(f"Failed to send event {row['event_id']} to SQS: {e}")
-                        connection.rollback()
+            while True:
+                rows = stream_cursor.fetchmany(PAGE_SIZE)
+                if not rows:
+                    break
+                total_rows += len(rows)
+                events_sent_to_sqs += process_page(connection, table_name, rows)
+            print(f"Found {total_rows} events")
 
         # Send email notification with processing summary
         body_data = {
              "text": (
                    "Hi team,\n\n"
                    "Event has been processed. Once checking is done, you will receive details in an email.\n\n"
-                   f"Processed {len(rows)} events and sent {events_sent_to_sqs} to SQS."
+                   f"Processed {total_rows} events and sent {events_sent_to_sqs} to SQS."
                 ),
              "html": (
                     f"<p>Hi team,</p>"
                     f"<p>Event has been processed. Once checking is done, you will receive details in an email.</p>"
-                    f"<p>Processed <strong>{len(rows)}</strong> events and sent <strong>{events_sent_to_sqs}</strong> to SQS.</p>"
+                    f"<p>Processed <strong>{total_rows}</strong> events and sent <strong>{events_sent_to_sqs}</strong> to SQS.</p>"
                 )
             }
 
@@ -207,7 +249,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Return success response
         return {
             'statusCode': 200,
-            'body': json.dumps(f"Processed {len(rows)} events and sent {events_sent_to_sqs} to SQS")
+            'body': json.dumps(f"Processed {total_rows} events and sent {events_sent_to_sqs} to SQS")
         }
 
     except pymysql.MySQLError as e:
@@ -218,6 +260,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
     finally:
         # Ensure database connection is always closed
+        if stream_connection:
+            stream_connection.close()
         if connection:
             connection.close()
             print("Database connection closed")
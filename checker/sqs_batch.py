@@ -0,0 +1,74 @@
+import json
+import logging
+import time
+from typing import List, Sequence, Tuple, Union
+
+logger = logging.getLogger()
+
+# Hard limit on entries per SendMessageBatch call
+SQS_BATCH_SIZE = 10
+
+
+def send_message_batches(client, queue_url: str, messages: Sequence[Union[dict, str]],
+                         max_attempts: int = 3, backoff_seconds: float = 0.5) -> Tuple[List[int], List[int]]:
+    """
+    Send messages to an SQS queue with send_message_batch, 10 entries per call.
+
+    Entries that fail for a server-side reason (throttling, internal errors)
+    are retried on their own, up to ``max_attempts`` times; sender faults
+    (bad body, too large, ...) are not retried.
+
+    Args:
+        client: boto3 SQS client
+        queue_url: Target queue URL
+        messages: Message bodies; dicts are JSON-encoded
+        max_attempts: Attempts per entry before it is reported as failed
+        backoff_seconds: Base delay between attempts, multiplied by the attempt number
+
+    Returns:
+        (sent, failed): positions in ``messages`` that were delivered / given up on
+    """
+    sent: List[int] = []
+    failed: List[int] = []
+
+    for start in range(0, len(messages), SQS_BATCH_SIZE):
+        pending = {}
+        for pos in range(start, min(start + SQS_BATCH_SIZE, len(messages))):
+            body = messages[pos]
+            pending[str(pos)] = body if isinstance(body, str) else json.dumps(body, default=str)
+
+        attempt = 0
+        while pending:
+            attempt += 1
+            try:
+                response = client.send_message_batch(
+                    QueueUrl=queue_url,
+                    Entries=[{"Id": entry_id, "MessageBody": body} for entry_id, body in pending.items()]
+                )
+            except Exception as e:
+                logger.warning("send_message_batch to %s failed (attempt %d/%d): %s", queue_url, attempt, max_attempts, e)
+                response = {"Failed": [{"Id": entry_id, "SenderFault": False, "Message": str(e)} for entry_id in pending]}
+
+            for entry in response.get("Successful", []):
+                if pending.pop(entry["Id"], None) is not None:
+                    sent.append(int(entry["Id"]))
+
+            for entry in response.get("Failed", []):
+                if entry["Id"] not in pending:
+                    continue
+                if entry.get("SenderFault") or attempt >= max_attempts:
+                    logger.error("SQS entry %s not sent to %s: %s %s", entry["Id"], queue_url,
+                                 entry.get("Code", ""), entry.get("Message", ""))
+                    pending.pop(entry["Id"])
+                    failed.append(int(entry["Id"]))
+
+            if pending and attempt >= max_attempts:
+                failed.extend(int(entry_id) for entry_id in pending)
+                pending.clear()
+            elif pending:
+                time.sleep(backoff_seconds * attempt)
+
+    sent.sort()
+    failed.sort()
+
+    return sent, failed
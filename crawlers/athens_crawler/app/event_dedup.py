@@ -0,0 +1,62 @@
+import logging
+from typing import Iterable, Sequence, Set
+
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+logger = logging.getLogger(__name__)
+
+EVENTS_TABLE = "events_to_process"
+
+# Only these columns may be probed; they are interpolated into the query text
+KEY_COLUMNS = ("event_id", "event_unique_id")
+
+# Keeps each IN (...) list well below MySQL's max_allowed_packet
+PROBE_CHUNK_SIZE = 500
+
+
+def fetch_existing_keys(engine, column: str, candidates: Iterable, chunk_size: int = PROBE_CHUNK_SIZE) -> Set[str]:
+    """
+    Return the subset of ``candidates`` already present in events_to_process.
+
+    Only the candidate values are sent to MySQL, in batched
+    ``WHERE <column> IN (...)`` probes, so the cost follows the size of the
+    crawl rather than the size of the table.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        column: Key column to probe, one of KEY_COLUMNS
+        candidates: Values produced by the current crawl
+        chunk_size: Maximum number of values per probe
+    """
+    if column not in KEY_COLUMNS:
+        raise ValueError(f"Unsupported dedup column: {column}")
+
+    values = sorted({str(value) for value in candidates if value is not None})
+    found: Set[str] = set()
+    if not values:
+        return found
+
+    query = text(
+        f"SELECT {column} FROM {EVENTS_TABLE} WHERE {column} IN :keys"
+    ).bindparams(bindparam("keys", expanding=True))
+
+    with engine.connect() as conn:
+        for start in range(0, len(values), chunk_size):
+            rows = conn.execute(query, {"keys": values[start:start + chunk_size]})
+            found.update(str(row[0]) for row in rows)
+
+    return found
+
+
+def drop_existing_events(engine, df: pd.DataFrame, columns: Sequence[str] = KEY_COLUMNS) -> pd.DataFrame:
+    """
+    Return the rows of ``df`` whose values in ``columns`` are all new to
+    events_to_process. A row is dropped if any one of its keys already exists.
+    """
+    keep = pd.Series(True, index=df.index)
+    for column in columns:
+        existing = fetch_existing_keys(engine, column, df[column])
+        logger.info("[drop_existing_events] %d of %d %s values already stored", len(existing), len(df), column)
+        keep &= ~df[column].astype(str).isin(existing)
+    return df[keep]
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import html
 import json
 import logging
 import os
@@ -10,11 +9,12 @@ from datetime import datetime, timedelta
 import pandas as pd
 from sqlalchemy import create_engine, types
 from sqlalchemy.exc import IntegrityError
-from thefuzz import fuzz
 
 from app.read_config   import read_config
 from app.skybox_api    import get_event
 from app.athens_api    import get_list_of_events, get_event_instances  # ← new import
+from app.skybox_matcher import SkyboxMatcher
+from app.event_dedup    import drop_existing_events
 
 # ──────────────────────────────────────────────────────────────
 # ENVIRONMENT
@@ -29,7 +29,6 @@ DB_USER     = config.get("DB_USER")
 bucket_name = config.get("BucketName", "")
 
 LOOKAHEAD_DAYS = int(config.get("Days", 730))        # default: 2 years
-SKY_DT_FMT      = "%Y-%m-%d %H:%M"
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -74,15 +73,7 @@ def lambda_handler(event: dict, context) -> dict:
     )["rows"]
     logger.info("SkyBox rows fetched: %d", len(sky_rows))
 
-    sky_index: list[tuple[str, str, dict]] = []
-    for r in sky_rows:
-        dt_sky = datetime.fromisoformat(r["date"].rstrip("Z").split(".", 1)[0])
-        name_sky = re.sub(
-            r'[<>:&"/\\|?*\'\x00-\x1F]',
-            " ",
-            html.unescape(re.sub(r"<.*?>", "", r["name"]))
-        ).lower().strip()
-        sky_index.append((dt_sky.strftime(SKY_DT_FMT), name_sky, r))
+    matcher = SkyboxMatcher(sky_rows, fuzzy_number=50)
 
     # ------------------------------------------------------------------
     # 3️⃣  WIDGET SOURCE  (Spektrix instances, widget format)
@@ -112,22 +103,14 @@ def lambda_handler(event: dict, context) -> dict:
         #         matched = rec
         #         break
 
-        matched: dict | None = None
-        best_delta = 999999
-        for dt_sky_str, name_sky, rec in sky_index:
-            # title must be similar
-            if fuzz.partial_ratio(ev["event_name"].lower(), name_sky) < 50:
-                continue
-
-            # choose the SkyBox row whose datetime is closest (same day typically)
-            dt_sky = datetime.strptime(dt_sky_str, SKY_DT_FMT)
-            delta  = abs((dt_sky - ev_dt).total_seconds())
-            if delta < best_delta:
-                best_delta = delta
-                matched    = rec
+        # title must be similar; choose the SkyBox row whose datetime is
+        # closest (same day typically)
+        matched = matcher.match_nearest(
+            ev["event_name"].lower(), ev_dt, max_delta=timedelta(hours=12)
+        )
 
         # require the datetime to be reasonably close (e.g. 12 h)
-        if matched is None or best_delta > 12*3600:
+        if matched is None:
             logger.info("No SkyBox match for %s – skipping", ev["event_name"])
             continue
 
@@ -174,12 +157,10 @@ def lambda_handler(event: dict, context) -> dict:
     df = pd.DataFrame(rows_to_insert)
 
     try:
-        existing = pd.read_sql("SELECT event_unique_id FROM events_to_process", eng)
+        df_new = drop_existing_events(eng, df, ("event_unique_id",))
     except Exception as e:
         logger.warning("Could not read existing – assuming empty: %s", e)
-        existing = pd.DataFrame(columns=["event_unique_id"])
-
-    df_new = df[~df["event_unique_id"].isin(existing["event_unique_id"])]
+        df_new = df
 
     if df_new.empty:
         logger.info("No new rows after de‑dup")
@@ -1,7 +1,11 @@
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from dateutil import parser
 import re
+from rate_limiter import HostRateLimiter
 
 PROPERTY_ID = "44e610ab-c209-4232-8bb4-51f7b9b13a75"
 
@@ -13,6 +17,13 @@ MAX_RETRY_COUNT = 3
 
 AUTH_TOKEN = ""
 
+# Per-show GraphQL calls run on a bounded pool, rate limited per host
+MGM_MAX_WORKERS = int(os.environ.get("MGM_MAX_WORKERS", 8))
+MGM_REQUESTS_PER_SECOND = float(os.environ.get("MGM_REQUESTS_PER_SECOND", 10))
+
+_rate_limiter = HostRateLimiter(MGM_REQUESTS_PER_SECOND)
+_token_lock = threading.Lock()
+
 url = "https://api.mgmresorts.com/graphql-next"
 base_url = "https://mandalaybay.mgmresorts.com/book-show/{}/seats/?event={}"
 
@@ -47,11 +58,25 @@ def get_auth_token():
     except Exception as e:
         print("An exception has occurred while fetching auth token."+str(e))
                 
+def refresh_auth_token(stale_token):
+    """
+    Fetch a new AUTH_TOKEN after a 401, unless another thread has already
+    replaced ``stale_token`` - concurrent 401s refresh the token once.
+    """
+    with _token_lock:
+        if AUTH_TOKEN == stale_token:
+            get_auth_token()
+
+def mgm_post(url, **kwargs):
+    _rate_limiter.wait(url)
+    return requests.post(url, **kwargs)
+
 def get_events():
     retry_count = 0
 
     try:
         while retry_count < MAX_RETRY_COUNT:
+            used_token = AUTH_TOKEN
             events_list = []
             headers = {
                 "Accept-Language": "en-US,en;q=0.9",
@@ -63,7 +88,7 @@ def get_events():
                 "Sec-Fetch-Site": "same-site",
                 "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Mobile Safari/537.36",
                 "accept": "*/*",
-                "authorization": f"Bearer {AUTH_TOKEN}",
+                "authorization": f"Bearer {used_token}",
                 "content-type": "application/json",
                 "x-mgm-channel": "web",
                 "x-mgm-source": "mgmri"
@@ -89,7 +114,7 @@ def get_events():
                 "query": "query SearchCategory($params: CategorySearchParams!) {\n  searchCategory(params: $params) {\n    total\n    fusionQueryId\n    results {\n      id\n      coverImage {\n        alt\n        src\n        __typename\n      }\n      bookingURL\n      targetURL\n      name\n      detailA\n      detailB\n      detailC\n      detailD\n      open\n      __typename\n    }\n    facetFields {\n      name\n      value {\n        key\n        occurrences\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}"
             }
 
-            response = requests.post(url, headers=headers, json=data)
+            response = mgm_post(url, headers=headers, json=data)
 
             if response.status_code == 200:
                 events_json_data = response.json()
@@ -116,7 +141,7 @@ def get_events():
                 break
             elif response.status_code == 401:
                 retry_count += 1
-                get_auth_token()
+                refresh_auth_token(used_token)
 
             else:
                 print(f"Request to fetch events failed with status code {response.status_code}")
@@ -134,6 +159,7 @@ def get_shows(event, start_date, end_date):
 
     try:
         while retry_count < MAX_RETRY_COUNT:
+            used_token = AUTH_TOKEN
             shows_list = []
             event_id = event.get("event_id","")
             event_name = event.get("event_name","")
@@ -151,7 +177,7 @@ def get_shows(event, start_date, end_date):
                 "Sec-Fetch-Mode": "cors",
                 "Sec-Fetch-Site": "same-site",
                 "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Mobile Safari/537.36",
-                "authorization": f"Bearer {AUTH_TOKEN}",
+                "authorization": f"Bearer {used_token}",
                 "x-mgm-channel": "web",
                 "x-mgm-source": PROPERTY_ID
             }
@@ -184,7 +210,7 @@ def get_shows(event, start_date, end_date):
                 "operationName": "GetEventsAvailabilityForShow"
             }
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = mgm_post(url, headers=headers, json=payload)
 
             if response.status_code == 200:
                 print("Request to fetch shows is successfull.")
@@ -213,7 +239,7 @@ def get_shows(event, start_date, end_date):
                 break
             elif response.status_code == 401:
                 retry_count += 1
-                get_auth_token()
+                refresh_auth_token(used_token)
 
             else:
                 raise Exception(f"Request to fetch shows failed with status code {response.status_code}")
@@ -230,6 +256,7 @@ def get_event_details(event):
 
     try:
         while retry_count < MAX_RETRY_COUNT:
+            used_token = AUTH_TOKEN
             service_charge_amount = 0
             seasons_dict = {}
             event_id = event.get("event_id","")
@@ -247,7 +274,7 @@ def get_event_details(event):
                 "Sec-Fetch-Mode": "cors",
                 "Sec-Fetch-Site": "same-site",
                 "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Mobile Safari/537.36",
-                "Authorization": f"Bearer {AUTH_TOKEN}",
+                "Authorization": f"Bearer {used_token}",
                 "x-mgm-channel": "web",
                 "x-mgm-source": PROPERTY_ID
             }
@@ -442,7 +469,7 @@ def get_event_details(event):
                 "operationName": "GetShow"
             }
 
-            response = requests.post(url, headers=headers, json=data)
+            response = mgm_post(url, headers=headers, json=data)
 
             if response.status_code == 200:
                 print("Request to fetch event details is successfull.")
@@ -460,7 +487,7 @@ def get_event_details(event):
             
             elif response.status_code == 401:
                 retry_count += 1
-                get_auth_token()
+                refresh_auth_token(used_token)
             else:
                 raise Exception(f"Request to fetch event details failed with status code {response.status_code}")
         else:
@@ -477,9 +504,15 @@ def get_list_of_events(start_date, end_date):
     all_events_list = []
     try:
         main_events = get_events()
-        for event_obj in main_events:
+
+        # One GetEventsAvailabilityForShow call per show, issued concurrently
+        with ThreadPoolExecutor(max_workers=MGM_MAX_WORKERS) as pool:
+            shows_futures = [pool.submit(get_shows, event=event_obj, start_date=start_date, end_date=end_date)
+                             for event_obj in main_events]
+
+        for event_obj, shows_future in zip(main_events, shows_futures):
             try:
-                shows = get_shows(event=event_obj, start_date=start_date, end_date=end_date)
+                shows = shows_future.result()
                 if not shows:
                     raise Exception("No shows found.")
 
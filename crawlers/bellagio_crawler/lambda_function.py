@@ -1,5 +1,5 @@
 # Standard library imports
-import json, logging, html, re
+import json, logging
 from datetime import datetime, timedelta
 from typing import List, Dict
 
@@ -7,21 +7,19 @@ from typing import List, Dict
 import pandas as pd
 from sqlalchemy import create_engine, types
 from sqlalchemy.exc import IntegrityError
-from thefuzz import fuzz  # For fuzzy string matching
 
 # Custom module imports
 from read_config import read_config                # Reads config from external source
 from skybox_api import get_event                   # Fetches events from SkyBox API
 from bellagio_api import get_list_of_events      # Fetches events from Bellagio widget
 from error_logger import log_error_to_db           # Logs error details to database
+from skybox_matcher import SkyboxMatcher           # Indexes SkyBox events for matching
+from event_dedup import drop_existing_events       # Probes events_to_process for known IDs
 
 # Initialize logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Constant format for SkyBox datetime strings
-SKY_DT_FMT  = "%Y-%m-%d %H:%M"
-
 
 def lambda_handler(event, _ctx):
     """
@@ -89,18 +87,9 @@ def lambda_handler(event, _ctx):
         eng.dispose()
         return {"statusCode": 500, "body": json.dumps("SkyBox fetch failed")}
 
-    # Preprocess SkyBox events (normalize, filter)
-    sky_tuples: List[tuple[str, str]] = []
-    for r in sky_rows:
-        dt_obj = datetime.fromisoformat(r["date"].rstrip("Z").split(".", 1)[0])
-        if today.date() <= dt_obj.date() <= (today + timedelta(days=daysToSkip)).date():
-            logger.info("Skipping event within next 7 days: %s on %s", r["name"], dt_obj)
-            continue
-        dt_str = dt_obj.strftime(SKY_DT_FMT)
-        clean = re.sub(r'[<>:&"/\\|?*\'\x00-\x1F]', " ",
-                       html.unescape(re.sub(r"<.*?>", "", r["name"]))).lower().strip()
-        sky_tuples.append((dt_str, clean, r))
-    logger.info("[lambda_handler] Normalized SkyBox event names and timestamps.")
+    # Index SkyBox events once by normalized datetime for matching
+    matcher = SkyboxMatcher(sky_rows, fuzzyNumber, canceledList)
+    logger.info("[lambda_handler] Indexed %d SkyBox events for matching.", matcher.indexed)
 
     # Fetch Bellagio widget events
     logger.info("[lambda_handler] Fetching Bellagio widget events...")
@@ -145,30 +134,8 @@ def lambda_handler(event, _ctx):
                 logger.info("[lambda_handler] Skipping event within next %d days: %s on %s", daysToSkip, ev["event_name"], dt_obj)
                 continue
 
-            matched = None
-            for sb in sky_rows:
-                try:
-                    if not isinstance(sb, dict) or "date" not in sb:
-                        continue
-                        
-                    dt_sky = datetime.fromisoformat(sb["date"].split(".")[0].rstrip("Z"))
-                except Exception:
-                    continue
-
-                skybox_event_name = sb.get("name", "").lower()
-                if any(word in skybox_event_name for word in canceledList):
-                    continue
-
-                dt_evt_fmt = dt_obj.strftime("%m/%d/%Y %I:%M:%S %p")
-                dt_sky_fmt = dt_sky.strftime("%m/%d/%Y %I:%M:%S %p")
-
-                name_evt = ev["event_name"].lower().strip()
-                name_sky = re.sub(r'[<>:&"/\\|?*\'\x00-\x1F]', " ",
-                                  html.unescape(re.sub(r"<.*?>", "", sb["name"]))).lower().strip()
-
-                if dt_evt_fmt == dt_sky_fmt and fuzz.partial_ratio(name_evt, name_sky) >= fuzzyNumber:
-                    matched = sb
-                    break
+            name_evt = ev["event_name"].lower().strip()
+            matched = matcher.match(name_evt, dt_obj)
 
             if matched is None:
                 logger.info("[lambda_handler] Skipping unmatched event: %s (%s)", ev.get("event_name"), ev.get("show_id"))
@@ -215,24 +182,19 @@ def lambda_handler(event, _ctx):
     # Create dataframe for insertion
     df = pd.DataFrame(new_rows)
 
-    # Fetch existing rows to deduplicate
+    # Normalize datatypes
+    for col in ("event_id", "event_unique_id"):
+        df[col] = df[col].astype(str)
+
+    # Filter out duplicates, probing events_to_process only for this crawl's IDs
     try:
-        existing = pd.read_sql("SELECT event_id, event_unique_id FROM events_to_process", eng)
-        logger.info("[lambda_handler] Existing rows fetched: %d", len(existing))
+        new_df = drop_existing_events(eng, df, ("event_unique_id", "event_id"))
+        logger.info("[lambda_handler] Existing rows skipped: %d", len(df) - len(new_df))
     except Exception as exc:
         err_msg = f"Could not fetch existing rows: {exc}"
         logger.warning("[lambda_handler] %s", err_msg)
         log_error_to_db(eng, venue_name=venue_name, error_details=err_msg, process_name="crawler")
-        existing = pd.DataFrame(columns=["event_id", "event_unique_id"])
-
-    # Normalize datatypes
-    for col in ("event_id", "event_unique_id"):
-        df[col] = df[col].astype(str)
-        existing[col] = existing[col].astype(str)
-
-    # Filter out duplicates
-    new_df = df[~df["event_unique_id"].isin(existing["event_unique_id"]) &
-                ~df["event_id"].isin(existing["event_id"])]
+        new_df = df
     if new_df.empty:
         logger.info("[lambda_handler] No new rows to insert after deduplication.")
         eng.dispose()
@@ -0,0 +1,36 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class HostRateLimiter:
+    """
+    Spaces requests to the same host at least ``1 / requests_per_second``
+    seconds apart, across all threads of the container. A host that answers
+    429 can be paused for every thread with ``back_off``.
+
+    Args:
+        requests_per_second: Allowed request rate per host; 0 disables spacing
+    """
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url: str) -> None:
+        """Block until a request to ``url``'s host may be sent."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def back_off(self, url: str, seconds: float) -> None:
+        """Hold all requests to ``url``'s host for ``seconds``, e.g. after a 429."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            resume = time.monotonic() + seconds
+            self._next_slot[host] = max(self._next_slot.get(host, resume), resume)
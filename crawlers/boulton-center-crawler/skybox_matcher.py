@@ -0,0 +1,125 @@
+import html
+import logging
+import re
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from thefuzz import fuzz  # For fuzzy string matching
+
+logger = logging.getLogger(__name__)
+
+# Compiled once per container instead of once per (widget event × SkyBox row)
+_TAG_RE    = re.compile(r"<.*?>")
+_UNSAFE_RE = re.compile(r'[<>:&"/\\|?*\'\x00-\x1F]')
+
+# (original position, parsed datetime, normalized name, raw SkyBox row)
+_Entry = Tuple[int, datetime, str, dict]
+
+
+def normalize_event_name(name: str) -> str:
+    """
+    Strip HTML tags/entities and unsafe characters, then lowercase the name.
+    """
+    return _UNSAFE_RE.sub(" ", html.unescape(_TAG_RE.sub("", name or ""))).lower().strip()
+
+
+def parse_skybox_datetime(value: str) -> datetime:
+    """
+    Parse a SkyBox ISO date (e.g. "2025-09-12T19:30:00.000Z") into a naive datetime.
+    """
+    return datetime.fromisoformat(value.split(".")[0].rstrip("Z"))
+
+
+class SkyboxMatcher:
+    """
+    Index of SkyBox event rows used to match venue events against SkyBox.
+
+    Every SkyBox row is parsed and normalized once, then bucketed by its
+    datetime (to the second). A lookup only fuzzy-scores the rows sharing the
+    event's bucket, so matching N venue events against M SkyBox rows costs
+    roughly O(N + M) instead of O(N × M).
+
+    Args:
+        sky_rows: The "rows" list returned by skybox_api.get_event
+        fuzzy_number: Minimum fuzz.partial_ratio score for a name match
+        cancelled_words: Rows whose lowercased name contains any of these are ignored
+    """
+
+    def __init__(self, sky_rows: Iterable[dict], fuzzy_number: int, cancelled_words: Iterable[str] = ()):
+        self.fuzzy_number = fuzzy_number
+        self.indexed = 0
+        self.skipped = 0
+
+        self._by_datetime: Dict[datetime, List[_Entry]] = defaultdict(list)
+        self._by_date: Dict[date, List[_Entry]] = defaultdict(list)
+
+        cancelled_words = list(cancelled_words)
+        for pos, row in enumerate(sky_rows):
+            if not isinstance(row, dict) or "date" not in row:
+                self.skipped += 1
+                continue
+            try:
+                dt_sky = parse_skybox_datetime(row["date"])
+            except Exception:
+                self.skipped += 1
+                continue
+
+            raw_name = row.get("name") or ""
+            if any(word in raw_name.lower() for word in cancelled_words):
+                self.skipped += 1
+                continue
+
+            entry = (pos, dt_sky, normalize_event_name(raw_name), row)
+            self._by_datetime[dt_sky.replace(microsecond=0)].append(entry)
+            self._by_date[dt_sky.date()].append(entry)
+            self.indexed += 1
+
+        logger.info("[SkyboxMatcher] Indexed %d SkyBox rows (%d skipped) into %d datetime buckets",
+                    self.indexed, self.skipped, len(self._by_datetime))
+
+    def match(self, event_name: str, event_dt: datetime) -> Optional[dict]:
+        """
+        Return the first SkyBox row at exactly ``event_dt`` whose name scores at
+        least ``fuzzy_number`` against ``event_name``, or None.
+
+        ``event_name`` is compared as given, so callers normalize it the way
+        their venue requires (typically ``.lower().strip()``).
+        """
+        for _, _, sky_name, row in self._by_datetime.get(event_dt.replace(microsecond=0), ()):
+            if fuzz.partial_ratio(event_name, sky_name) >= self.fuzzy_number:
+                return row
+        return None
+
+    def match_nearest(self, event_name: str, event_dt: datetime, max_delta: timedelta,
+                      min_ratio: Optional[int] = None) -> Optional[dict]:
+        """
+        Return the name-matching SkyBox row closest in time to ``event_dt``,
+        provided it lies within ``max_delta``; otherwise None.
+
+        Only the day buckets overlapping ``event_dt ± max_delta`` are scored.
+        Ties are resolved in the original SkyBox row order.
+        """
+        ratio = self.fuzzy_number if min_ratio is None else min_ratio
+
+        candidates: List[_Entry] = []
+        day = (event_dt - max_delta).date()
+        last_day = (event_dt + max_delta).date()
+        while day <= last_day:
+            candidates.extend(self._by_date.get(day, ()))
+            day += timedelta(days=1)
+        candidates.sort(key=lambda entry: entry[0])
+
+        matched = None
+        best_delta = None
+        for _, dt_sky, sky_name, row in candidates:
+            if fuzz.partial_ratio(event_name, sky_name) < ratio:
+                continue
+            delta = abs(dt_sky - event_dt)
+            if best_delta is None or delta < best_delta:
+                best_delta = delta
+                matched = row
+
+        if matched is None or best_delta > max_delta:
+            return None
+        return matched
@@ -10,7 +10,8 @@ from skybox_api import get_event
 from kennedy_center_api import get_list_of_events,check_onsale_date
 from curl_cffi import requests
 from datetime import datetime, timedelta
-from thefuzz import fuzz  
+from skybox_matcher import SkyboxMatcher
+from event_dedup import drop_existing_events
 
 
 
@@ -58,32 +59,9 @@ def lambda_handler(event, context):
             logger.error(f"Failed to fetch SkyBox events: {e}")
             return {"statusCode": 500, "body": json.dumps("SkyBox fetch failed")}
 
-        # Step 2: Create SkyBox tuples with 7-day buffer (like Helena)
-        sky_tuples = []
-        for r in sky_rows:
-            try:
-                dt_obj = datetime.fromisoformat(r["date"].rstrip("Z").split(".", 1)[0])
-            except Exception:
-                continue
-                
-            # Apply business rule: Skip events within the "skip window" (typically next 7 days)
-            # This prevents processing events that are too imminent for ticket processing
-            if today.date() <= dt_obj.date() <= (today + timedelta(days=daysToSkip)).date():
-                logger.info("Skipping Skybox event within next %d days: %s on %s",daysToSkip, r['name'], dt_obj)
-                continue
-                
-            # Skip cancelled events
-            event_name_lower = r.get('name', '').lower()
-            if any(word in event_name_lower for word in ['cancelled', 'canceled', 'postponed']):
-                logger.info(f"Skipping cancelled/postponed Skybox event: {r['name']}")
-                continue
-                
-            dt_str = dt_obj.strftime(output_format)
-            clean = re.sub(r'[<>:&"/\\|?*\'\x00-\x1F]', " ",
-                          html.unescape(re.sub(r"<.*?>", "", r["name"]))).lower().strip()
-            sky_tuples.append((dt_str, clean, r))
-
-        logger.info(f"SkyBox events after filtering: {len(sky_tuples)}")
+        # Step 2: Index SkyBox events by datetime, skipping cancelled/postponed ones
+        matcher = SkyboxMatcher(sky_rows, fuzzyNumber, ['cancelled', 'canceled', 'postponed'])
+        logger.info(f"SkyBox events indexed for matching: {matcher.indexed}")
 
         # Step 3: Get Kennedy Center events
         events_api_url = config.get('Kennedy_Center_EventAPI_URL')
@@ -149,12 +127,9 @@ def lambda_handler(event, context):
                 date_str = dt_obj.strftime("%Y-%m-%d")   # just date
                 time_str = dt_obj.strftime("%H:%M:%S") 
 
-                matched = None
-                for sky_dt_str, sky_name, sky_row in sky_tuples:
-                    if sky_dt_str == dt_key and fuzz.partial_ratio(ev_name_clean, sky_name) >= fuzzyNumber:
-                        matched = sky_row
-                        logger.info(f"Matched event: {event_name} with Skybox: {sky_row.get('name', '')}")
-                        break
+                matched = matcher.match(ev_name_clean, dt_obj)
+                if matched is not None:
+                    logger.info(f"Matched event: {event_name} with Skybox: {matched.get('name', '')}")
 
                 if matched is None:
                     logger.info(f"Skipping unmatched event: {event_name} on {dt_key}")
@@ -190,13 +165,8 @@ def lambda_handler(event, context):
                     pool_pre_ping=True
                 )
                 
-                # Check for duplicates
-                existing_ids = pd.read_sql(
-                    "SELECT DISTINCT event_unique_id FROM events_to_process",
-                    engine
-                )['event_unique_id'].tolist()
-                
-                new_events = events_df[~events_df['event_unique_id'].isin(existing_ids)]
+                # Check for duplicates against this crawl's IDs only
+                new_events = drop_existing_events(engine, events_df, ('event_unique_id',))
                 
                 if len(new_events) < len(events_df):
                     logger.info(f"Filtered out {len(events_df) - len(new_events)} duplicates")
@@ -9,6 +9,7 @@ from scraper_mapping import scrapers, ui_scrapers
 import logging
 from read_config import read_config
 from email_notification import send_email
+from sqs_batch import send_message_batches
 
 # Initialize SQS client
 sqs = boto3.client('sqs')
@@ -30,6 +31,20 @@ DB_CONFIG = {
 SQS_QUEUE_URL = os.environ.get("SQS_QUEUE_URL")
 FARGATE_SQS_QUEUE_URL = os.environ.get("FARGATE_SQS_QUEUE_URL")
 
+# Number of events claimed and sent per round trip
+CLAIM_PAGE_SIZE = int(os.environ.get("CLAIM_PAGE_SIZE", 200))
+
+# Locks the next page of unlisted events; rows locked by a concurrent run are skipped.
+# Paging on event_id keeps unmapped venues (left unclaimed) from being re-read.
+CLAIM_QUERY = """
+    SELECT * FROM events_to_process
+    WHERE status = 'active' AND is_listed = 0 AND is_being_processed = 0 AND in_sqs = 0
+      AND event_id > %s
+    ORDER BY event_id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+
 
 # convert email_recipient into list
 email_recipient = config.get("RecipientEmailIds")
@@ -39,6 +54,72 @@ if isinstance(email_recipient, str):
 email_subject='Lister AWS Prod'
 
 
+def prepare_message(row: Dict[str, Any]) -> bool:
+    """
+    Turn an events_to_process row into an SQS message body in place.
+
+    Returns False when the venue has no scraper mapping.
+    """
+    # Convert datetime objects to strings (if any)
+    for key, value in row.items():
+        if isinstance(value, datetime):
+            row[key] = value.strftime("%Y-%m-%d %H:%M:%S")
+        # Boolean values are already JSON-serializable, no conversion needed
+
+    # Determine processing runtime based on venue mapping
+    # Check if venue exists in standard scrapers (Lambda runtime)
+    if 'venue_name' in row and row['venue_name'] in scrapers:
+        row['scraper_func_name'] = scrapers[row['venue_name']]  # Set scraper function name
+        row['runtime'] = 'lambda'  # Use Lambda runtime for standard scrapers
+    # Check if venue exists in UI scrapers (Fargate runtime)
+    elif 'venue_name' in row and row['venue_name'] in ui_scrapers:
+        row['task_def'] = ui_scrapers[row['venue_name']]  # Set task definition
+        row['runtime'] = 'fargate'  # Use Fargate runtime for UI scrapers
+    else:
+        # Skip events with unmapped venues
+        logging.warning(f"Venue name {row['venue_name']} not found in scraper mapping")
+        return False
+
+    # Add metadata for processing
+    row['env'] = 'prod'           # Environment identifier
+    row['process_name'] = 'lister'  # Process type identifier
+    return True
+
+
+def claim_page(connection, cursor, after_event_id: str, page_size: int = CLAIM_PAGE_SIZE):
+    """
+    Lock the next page of unlisted events and set in_sqs = 1 on the mapped ones
+    in a single UPDATE and commit.
+
+    Returns:
+        (rows, claimed): the raw page, and the prepared rows now owned by this run
+        (one per event_id)
+    """
+    cursor.execute(CLAIM_QUERY, (after_event_id, page_size))
+    rows = cursor.fetchall()
+
+    claimed = {}
+    for row in rows:
+        if row['event_id'] not in claimed and prepare_message(row):
+            claimed[row['event_id']] = row
+
+    if claimed:
+        cursor.execute(
+            "UPDATE events_to_process SET in_sqs = 1 WHERE event_id IN %s AND in_sqs = 0",
+            (list(claimed),)
+        )
+    connection.commit()
+    return rows, list(claimed.values())
+
+
+def release_claims(connection, cursor, event_ids: List[str]) -> None:
+    """
+    Reset in_sqs for claimed events whose messages could not be sent.
+    """
+    cursor.execute("UPDATE events_to_process SET in_sqs = 0 WHERE event_id IN %s", (event_ids,))
+    connection.commit()
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda handler function for processing events for listing.
@@ -64,113 +145,64 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps(f"Database connection failed: {e}")
         }
 
+    total_rows = 0
+    event_count = 0
+    last_event_id = ""
     with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-        # Execute the query
-        query = "SELECT * FROM events_to_process WHERE status = 'active' AND is_listed = 0 AND is_being_processed=0 AND in_sqs=0"
-        try:
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            print(f"Found {len(rows)} active, unlisted events")
-        except pymysql.MySQLError as e:
-            print(f"Query failed: {e}")
-            connection.close()
-            return {
-                'statusCode': 500,
-                'body': json.dumps(f"Query failed: {e}")
-            }
-
-        # Send each row to SQS
-        event_count =0
-        for row in rows:
-            # Convert datetime objects to strings (if any)
-            for key, value in row.items():
-                if isinstance(value, datetime):
-                    row[key] = value.strftime("%Y-%m-%d %H:%M:%S")
-                # Boolean values are already JSON-serializable, no conversion needed
-
-            # Determine processing runtime based on venue mapping
-            # Check if venue exists in standard scrapers (Lambda runtime)
-            if 'venue_name' in row and row['venue_name'] in scrapers:
-                row['scraper_func_name'] = scrapers[row['venue_name']]  # Set scraper function name
-                row['runtime'] = 'lambda'  # Use Lambda runtime for standard scrapers
-            # Check if venue exists in UI scrapers (Fargate runtime)
-            elif 'venue_name' in row and row['venue_name'] in ui_scrapers:
-                row['task_def'] = ui_scrapers[row['venue_name']]  # Set task definition
-                row['runtime'] = 'fargate'  # Use Fargate runtime for UI scrapers
-            else:
-                # Skip events with unmapped venues
-                logging.warning(f"Venue name {row['venue_name']} not found in scraper mapping")
-                continue
-
-            # Add metadata for processing
-            row['env'] = 'prod'           # Environment identifier
-            row['process_name'] = 'lister'  # Process type identifier
-            if row['runtime'] == 'lambda':
-                # Send message to SQS
-                try:
-                    cursor.execute("SELECT in_sqs FROM events_to_process WHERE event_id = %s",(row['event_id']))
-
-                    in_sqs_result = cursor.fetchone()
-                    if in_sqs_result and in_sqs_result['in_sqs'] == 0:
-                        response = sqs.send_message(
-                            QueueUrl=SQS_QUEUE_URL,
-                            MessageBody=json.dumps(row)
-                        )
-                        # Update the event in the database to indicate its in SQS
-                        try:
-                            update_query = "UPDATE events_to_process SET in_sqs = 1 WHERE event_id = %s"
-                            cursor.execute(update_query, (row['event_id']))
-                            connection.commit()
-                            print(f"Updated event {row['event_id']} in database")
-
-                        except pymysql.MySQLError as e:
-                            print(f"Failed to update event in database: {e}")
-
-                        print(f"Sent message to SQS: {response['MessageId']}")
-                        event_count += 1
-                except Exception as e:
-                    print(f"Failed to send to SQS: {e}")
-            else:
-                # Send message to Fargate SQS
+        while True:
+            # Claim the next page of events atomically
+            try:
+                rows, claimed = claim_page(connection, cursor, last_event_id)
+            except pymysql.MySQLError as e:
+                print(f"Query failed: {e}")
+                connection.rollback()
+                connection.close()
+                return {
+                    'statusCode': 500,
+                    'body': json.dumps(f"Query failed: {e}")
+                }
+            if not rows:
+                break
+            total_rows += len(rows)
+            last_event_id = rows[-1]['event_id']
+            print(f"Claimed {len(claimed)} of {len(rows)} active, unlisted events")
+
+            # Send the page to the Lambda and Fargate queues in batches
+            failed_ids = []
+            for runtime, queue_url in (('lambda', SQS_QUEUE_URL), ('fargate', FARGATE_SQS_QUEUE_URL)):
+                messages = [row for row in claimed if row['runtime'] == runtime]
+                if not messages:
+                    continue
+                sent, failed = send_message_batches(sqs, queue_url, messages)
+                event_count += len(sent)
+                failed_ids.extend(messages[pos]['event_id'] for pos in failed)
+                print(f"Sent {len(sent)} messages to {runtime} SQS, {len(failed)} failed")
+
+            # Give back the claims whose messages never reached SQS
+            if failed_ids:
                 try:
-                    cursor.execute("SELECT in_sqs FROM events_to_process WHERE event_id = %s", (row['event_id'],))
-                    in_sqs_result = cursor.fetchone()
-                    if in_sqs_result and in_sqs_result['in_sqs'] == 0:
-                        response = sqs.send_message(
-                        QueueUrl=FARGATE_SQS_QUEUE_URL,
-                        MessageBody=json.dumps(row)
-                        )
-                        try:
-
-                            update_query = "UPDATE events_to_process SET in_sqs = 1 WHERE event_id = %s"
-                            cursor.execute(update_query, (row['event_id']))
-                            connection.commit()
-                            print(f"Updated event {row['event_id']} in database")
-                            print(f"Sent message to Fargate SQS: {response['MessageId']}")
-                        except pymysql.MySQLError as e:
-                            print(f"Failed to update event in database: {e}")
-
-                        event_count += 1
-
-
-                except Exception as e:
-                    print(f"Failed to send to Fargate SQS: {e}")
+                    release_claims(connection, cursor, failed_ids)
+                    print(f"Released {len(failed_ids)} unsent events")
+                except pymysql.MySQLError as e:
+                    print(f"Failed to release unsent events {failed_ids}: {e}")
+                    connection.rollback()
 
     # Clean up
     connection.close()
     print("Database connection closed")
+    print(f"Found {total_rows} active, unlisted events, sent {event_count} to SQS")
     
     # Send email notification with processing summary
     body_data = {
              "text": (
                    "Hi team,\n\n"
                    "Event has been processed. Once listing is done, you will receive details in an email.\n\n"
-                   f"Processed {len(rows)} events and sent {event_count} to SQS."
+                   f"Processed {total_rows} events and sent {event_count} to SQS."
                 ),
              "html": (
                     f"<p>Hi team,</p>"
                     f"<p>Event has been processed. Once listing is done, you will receive details in an email.</p>"
-                    f"<p>Processed <strong>{len(rows)}</strong> events and sent <strong>{event_count}</strong> to SQS.</p>"
+                    f"<p>Processed <strong>{total_rows}</strong> events and sent <strong>{event_count}</strong> to SQS.</p>"
                 )
             }
 
@@ -180,5 +212,5 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     
     return {
         'statusCode': 200,
-        'body': json.dumps(f"Processed {len(rows)} events and sent to SQS")
+        'body': json.dumps(f"Processed {total_rows} events and sent to SQS")
     }
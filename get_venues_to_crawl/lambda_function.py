@@ -4,6 +4,11 @@ import os
 import pandas as pd
 from sqlalchemy import create_engine
 
+from sqs_batch import send_message_batches
+
+# venue_list columns copied into every crawler message
+MESSAGE_COLUMNS = ["id", "venue_name", "venue_url", "extraction_mode", "venue_status", "crawler_func_name"]
+
 # def setup_db_connection():
 #     conn = mysql.connector.connect(
 #         host=os.getenv("DB_HOST"),
@@ -38,47 +43,42 @@ def lambda_handler(event, context):
     df_venues = pd.read_sql(query, eng)
     print(df_venues.head())
     try:
+        counts = {}
+        for runtime, queue_url, messages in build_venue_messages(df_venues, FARGATE_SQS_QUEUE_URL, SQS_QUEUE_URL):
+            sent, failed = send_message_batches(client, queue_url, messages)
+            counts[runtime] = {"sent": len(sent), "failed": len(failed)}
+            print(f"{runtime} crawler SQS: {len(sent)} sent, {len(failed)} failed")
+            for pos in failed:
+                print(f"Failed to queue venue: {messages[pos]['venue_name']}")
 
-        for _, row in df_venues.iterrows():
-            
-            message = {
-                "id": row["id"],
-                "venue_name": row["venue_name"],
-                "venue_url": row["venue_url"],
-                "extraction_mode": row["extraction_mode"],
-                "venue_status": row["venue_status"],
-                "crawler_func_name": row["crawler_func_name"]
-            }
-            if row["extraction_mode"] == "fargate":
-                message["task_def"] = row["crawler_func_name"]
-                message["runtime"] = "fargate"
-            else:
-                message["runtime"] = "lambda"
-
-          
-
-            if message['runtime'] == "fargate":
-                response = client.send_message(
-                    QueueUrl=FARGATE_SQS_QUEUE_URL,
-                    MessageBody=json.dumps(message)
-                )
-                print(f"Message sent to Fargate crawler SQS: {response['MessageId']}")
-            else:
-                response = client.send_message(
-                        QueueUrl=SQS_QUEUE_URL,
-                        MessageBody=json.dumps(message)
-                )
-                print(f"Message sent to Lambda crawler SQS: {response['MessageId']}")
-            
         return {
-            'statusCode': 200
+            'statusCode': 200,
+            'body': json.dumps(counts)
             }
     except Exception as e:
         print(f"Error sending message to SQS: {e}")
         return {
         'statusCode': 500
     }
+    finally:
+        eng.dispose()
+
+
+def build_venue_messages(df_venues, fargate_queue_url, lambda_queue_url):
+    """
+    Build crawler messages for every venue, grouped by target queue.
 
+    Returns a list of (runtime, queue_url, messages) with one entry per runtime
+    that has at least one venue.
+    """
+    is_fargate = df_venues["extraction_mode"] == "fargate"
+    fargate = df_venues.loc[is_fargate, MESSAGE_COLUMNS]
+    lambdas = df_venues.loc[~is_fargate, MESSAGE_COLUMNS]
 
- 
- 
\ No newline at end of file
+    groups = [
+        ("fargate", fargate_queue_url,
+         fargate.assign(task_def=fargate["crawler_func_name"], runtime="fargate").to_dict(orient="records")),
+        ("lambda", lambda_queue_url,
+         lambdas.assign(runtime="lambda").to_dict(orient="records")),
+    ]
+    return [group for group in groups if group[2]]
@@ -0,0 +1,373 @@
+"""
+Shared engine for the SQS -> Step Function pollers.
+
+Every poller Lambda used to carry its own copy of the same loop. This engine
+runs that loop for one or more queues. Each queue is described by a
+declarative profile (see PROFILES) and paired with the queue URL and state
+machine ARN it feeds:
+
+1. Monitors the SQS queues for messages
+2. Manages concurrency per state machine with a locally tracked running count
+3. Shares an optional global concurrency budget between queues by weight
+4. Batches messages and triggers Step Function executions
+5. Ensures messages are only deleted after successful Step Function submission
+
+Environment Variables (all optional):
+- CONCURRENCY_RESYNC_SECONDS: Seconds between authoritative running-count syncs (default: 30)
+- POLL_INTERVAL_SECONDS: Pause after a receive that did not fill the batch (default: 1)
+- MAX_BACKOFF_SECONDS: Upper bound of the pause while Step Functions throttles (default: 16)
+"""
+
+import boto3
+import os
+import json
+import heapq
+from datetime import datetime
+import time
+from typing import Dict, List, Any, Optional
+
+# Initialize AWS service clients
+sqs = boto3.client('sqs')
+stepfunctions = boto3.client('stepfunctions')
+
+CONCURRENCY_RESYNC_SECONDS: int = int(os.environ.get('CONCURRENCY_RESYNC_SECONDS', 30))  # Max age of the local running count
+POLL_INTERVAL_SECONDS: float = float(os.environ.get('POLL_INTERVAL_SECONDS', 1))  # Pause after a partial receive
+MAX_BACKOFF_SECONDS: float = float(os.environ.get('MAX_BACKOFF_SECONDS', 16))  # Longest pause while throttled
+
+SQS_MAX_MESSAGES = 10  # receive_message / delete_message_batch hard limit
+THROTTLING_ERROR_CODES = ('ThrottlingException', 'ExecutionLimitExceeded', 'TooManyRequestsException')
+MAX_RUNTIME_SECONDS = 13 * 60  # 13 minutes (leave 2 min buffer for Lambda timeout)
+
+# Per-queue defaults. The six poller Lambdas differ only in these values.
+#   batch_size:             messages received per round (SQS caps this at 10)
+#   max_concurrency:        running executions allowed on the queue's state machine
+#   messages_per_execution: message bodies grouped into one execution input
+#   name_key:               message field used in the execution name
+#   input_shape:            "body_list" -> [{"body": "<json>"}, ...]
+#                           "messages"  -> {"messages": [{...}, ...]}
+#   weight:                 share of the global budget when queues compete
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "lambda-crawler":  {"batch_size": 10,  "max_concurrency": 260, "name_key": "venue_name", "input_shape": "body_list"},
+    "fargate-crawler": {"batch_size": 6,   "max_concurrency": 1,   "name_key": "venue_name", "input_shape": "body_list"},
+    "lambda-lister":   {"batch_size": 100, "max_concurrency": 300, "name_key": "event_id",   "input_shape": "body_list"},
+    "fargate-lister":  {"batch_size": 6,   "max_concurrency": 2,   "name_key": "event_id",   "input_shape": "body_list"},
+    "lambda-checker":  {"batch_size": 10,  "max_concurrency": 260, "name_key": "event_id",   "input_shape": "body_list"},
+    "fargate-checker": {"batch_size": 6,   "max_concurrency": 4,   "name_key": "event_id",   "input_shape": "messages"},
+}
+
+PROFILE_DEFAULTS: Dict[str, Any] = {"messages_per_execution": 1, "weight": 1}
+
+
+def get_running_execution_count(state_machine_arn):
+    paginator = stepfunctions.get_paginator('list_executions')
+    running_count = 0
+    for page in paginator.paginate(stateMachineArn=state_machine_arn, statusFilter='RUNNING'):
+        running_count += len(page['executions'])
+    return running_count
+
+
+class ConcurrencyTracker:
+    """
+    Local count of RUNNING Step Function executions.
+
+    The count is taken once from list_executions and then incremented as this
+    poller starts executions. Executions finishing are not observed, so the
+    local count can only overestimate and max_concurrency is still enforced.
+    It is re-synced when it is older than resync_seconds or when fewer than
+    resync_margin slots appear to be left.
+    """
+
+    def __init__(self, state_machine_arn: str, max_concurrency: int,
+                 resync_seconds: int = CONCURRENCY_RESYNC_SECONDS, resync_margin: int = SQS_MAX_MESSAGES):
+        self.state_machine_arn = state_machine_arn
+        self.max_concurrency = max_concurrency
+        self.resync_seconds = resync_seconds
+        self.resync_margin = resync_margin
+        self.running = 0
+        self.synced_at = 0.0
+
+    def sync(self) -> int:
+        self.running = get_running_execution_count(self.state_machine_arn)
+        self.synced_at = time.time()
+        return self.running
+
+    def remaining_capacity(self) -> int:
+        stale = time.time() - self.synced_at >= self.resync_seconds
+        near_cap = self.max_concurrency - self.running < self.resync_margin
+        if stale or near_cap:
+            self.sync()
+            print(f"Currently running executions for {self.state_machine_arn}: {self.running}")
+        return max(0, self.max_concurrency - self.running)
+
+    def started(self, count: int = 1) -> None:
+        self.running += count
+
+
+class AdaptiveBackoff:
+    """
+    Pause between polling rounds of one queue, replacing the fixed one-second sleep.
+
+    A full receive means the queue still has a backlog, so the next round starts
+    immediately. A partial receive waits POLL_INTERVAL_SECONDS. Throttling
+    doubles the wait, up to MAX_BACKOFF_SECONDS, until a round goes through cleanly.
+    """
+
+    def __init__(self, base_delay: float = POLL_INTERVAL_SECONDS, max_delay: float = MAX_BACKOFF_SECONDS):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttle_delay = 0.0
+
+    def next_delay(self, received: int, requested: int, throttled: bool) -> float:
+        if throttled:
+            self.throttle_delay = min(self.max_delay, max(self.base_delay, self.throttle_delay * 2))
+            return self.throttle_delay
+        self.throttle_delay = 0.0
+        return 0.0 if received >= requested else self.base_delay
+
+
+def build_execution_input(bodies: List[Dict[str, Any]], input_shape: str) -> str:
+    """Wrap message bodies in the input shape the state machine expects."""
+    if input_shape == "messages":
+        return json.dumps({"messages": bodies})
+    return json.dumps([{"body": json.dumps(body)} for body in bodies])
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """True for Step Functions errors that mean "slow down" rather than "bad input"."""
+    code = getattr(error, 'response', {}).get('Error', {}).get('Code', '')
+    return code in THROTTLING_ERROR_CODES
+
+
+def delete_messages(queue_url: str, messages: List[Dict[str, Any]]) -> int:
+    """Delete received messages with delete_message_batch; returns how many were deleted."""
+    deleted = 0
+    for start in range(0, len(messages), SQS_MAX_MESSAGES):
+        chunk = messages[start:start + SQS_MAX_MESSAGES]
+        try:
+            response = sqs.delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=[{"Id": str(i), "ReceiptHandle": msg['ReceiptHandle']} for i, msg in enumerate(chunk)]
+            )
+            deleted += len(response.get('Successful', []))
+            for failure in response.get('Failed', []):
+                print(f"Error deleting message: {failure.get('Code')} {failure.get('Message')}")
+        except Exception as e:
+            print(f"Error deleting message: {str(e)}")
+    return deleted
+
+
+class QueuePoller:
+    """
+    Moves messages from one SQS queue into executions of one state machine,
+    following a profile from PROFILES (plus any overrides).
+    """
+
+    def __init__(self, name: str, profile: Dict[str, Any], queue_url: str, tracker: ConcurrencyTracker):
+        self.name = name
+        self.profile = profile
+        self.queue_url = queue_url
+        self.tracker = tracker
+        self.backoff = AdaptiveBackoff()
+        self.next_poll_at = 0.0
+        self.done = False
+        self.stats = {"received": 0, "executions": 0, "deleted": 0}
+
+    @property
+    def weight(self) -> float:
+        return float(self.profile["weight"])
+
+    def capacity(self) -> int:
+        """Executions this queue may start in the next round."""
+        messages = min(self.profile["batch_size"], SQS_MAX_MESSAGES)
+        wanted = -(-messages // self.profile["messages_per_execution"])  # ceil
+        return min(wanted, self.tracker.remaining_capacity())
+
+    def poll(self, max_executions: int) -> None:
+        """Run one receive/start/delete round, starting at most max_executions executions."""
+        group_size = self.profile["messages_per_execution"]
+        batch_size = min(self.profile["batch_size"], SQS_MAX_MESSAGES, max_executions * group_size)
+
+        response = sqs.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=batch_size,
+            WaitTimeSeconds=1,
+            VisibilityTimeout=60
+        )
+
+        messages = response.get('Messages', [])
+        if not messages:
+            print(f"[{self.name}] No more messages in queue.")
+            self.done = True
+            return
+        self.stats["received"] += len(messages)
+
+        # Parse bodies; invalid JSON is deleted to prevent reprocessing
+        messages_to_delete = []
+        parsed = []
+        for msg in messages:
+            try:
+                parsed.append((msg, json.loads(msg['Body'])))
+            except json.JSONDecodeError:
+                print(f"[{self.name}] Invalid JSON in message body: {msg['Body']}")
+                messages_to_delete.append(msg)
+
+        # Start one Step Function execution per group of messages
+        throttled = False
+        for group_start in range(0, len(parsed), group_size):
+            group = parsed[group_start:group_start + group_size]
+            bodies = [body for _, body in group]
+
+            # Generate execution name from the group's first message
+            timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+            name_value = str(bodies[0].get(self.profile["name_key"], "unknown"))
+            execution_name = f"lambda-run-{timestamp}-{name_value}"
+            if len(group) > 1:
+                execution_name += f"-x{len(group)}"
+
+            try:
+                stepfunctions.start_execution(
+                    stateMachineArn=self.tracker.state_machine_arn,
+                    name=execution_name,
+                    input=build_execution_input(bodies, self.profile["input_shape"])
+                )
+                self.tracker.started()
+                self.stats["executions"] += 1
+                print(f"[{self.name}] Started Step Function execution: {execution_name} ({len(group)} messages)")
+
+                # Mark for deletion only after successful submission
+                messages_to_delete.extend(msg for msg, _ in group)
+
+            except Exception as e:
+                # Don't delete on Step Function errors - let message retry
+                print(f"[{self.name}] Error processing message: {str(e)}")
+                if is_throttling_error(e):
+                    throttled = True
+                    break
+
+        # Delete only successfully processed messages
+        deleted = delete_messages(self.queue_url, messages_to_delete)
+        self.stats["deleted"] += deleted
+        print(f"[{self.name}] Successfully processed {deleted} messages.")
+
+        # Pace the next round by queue backlog and throttling
+        self.next_poll_at = time.time() + self.backoff.next_delay(len(messages), batch_size, throttled)
+
+
+def fair_shares(demands: Dict[str, int], weights: Dict[str, float], budget: Optional[int]) -> Dict[str, int]:
+    """
+    Split ``budget`` execution slots between queues by weight (weighted
+    water-filling). A queue never gets more than it asked for, and slots it
+    does not need go to the others. ``budget=None`` means no global limit.
+    """
+    if budget is None:
+        return dict(demands)
+
+    shares = {name: 0 for name in demands}
+    heap = [(0.0, name) for name, demand in demands.items() if demand > 0 and weights[name] > 0]
+    heapq.heapify(heap)
+    while budget > 0 and heap:
+        _, name = heapq.heappop(heap)
+        shares[name] += 1
+        budget -= 1
+        if shares[name] < demands[name]:
+            heapq.heappush(heap, (shares[name] / weights[name], name))
+    return shares
+
+
+def run_pollers(pollers: List[QueuePoller], global_max_concurrency: Optional[int] = None,
+                max_runtime: int = MAX_RUNTIME_SECONDS) -> Dict[str, Any]:
+    """
+    Drain the given queues until each is empty or at its concurrency cap, the
+    global budget is used up, or the Lambda is close to timing out.
+
+    Returns per-queue counters.
+    """
+    print("Polling SQS and managing Step Function concurrency...")
+
+    # Add timeout protection
+    start_time = time.time()
+
+    # Pollers sharing a state machine also share its tracker
+    trackers = {id(poller.tracker): poller.tracker for poller in pollers}.values()
+
+    while True:
+        # Check if we're approaching Lambda timeout
+        if time.time() - start_time > max_runtime:
+            print("Approaching Lambda timeout. Exiting gracefully.")
+            break
+
+        active = [poller for poller in pollers if not poller.done]
+        if not active:
+            break
+
+        now = time.time()
+        ready = [poller for poller in active if poller.next_poll_at <= now]
+        if not ready:
+            time.sleep(min(poller.next_poll_at for poller in active) - now)
+            continue
+
+        demands = {}
+        for poller in ready:
+            demands[poller.name] = poller.capacity()
+            if demands[poller.name] <= 0:
+                print(f"[{poller.name}] Max concurrency reached. Exiting.")
+                poller.done = True
+
+        budget = None
+        if global_max_concurrency is not None:
+            budget = max(0, global_max_concurrency - sum(tracker.running for tracker in trackers))
+            if budget <= 0:
+                print("Global max concurrency reached. Exiting.")
+                break
+
+        shares = fair_shares(demands, {poller.name: poller.weight for poller in ready}, budget)
+        for poller in ready:
+            if not poller.done and shares.get(poller.name, 0) > 0:
+                poller.poll(shares[poller.name])
+
+    return {poller.name: poller.stats for poller in pollers}
+
+
+def build_profile(profile_name: str, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge PROFILE_DEFAULTS, the named profile and any non-empty overrides."""
+    if profile_name not in PROFILES:
+        raise ValueError(f"Unknown poller profile: {profile_name}")
+    profile = {**PROFILE_DEFAULTS, **PROFILES[profile_name]}
+    profile.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    return profile
+
+
+def build_pollers(queues: List[Dict[str, Any]]) -> List[QueuePoller]:
+    """
+    Create pollers from queue specs of the form
+    {"profile": ..., "queue_url": ..., "state_machine_arn": ..., <profile overrides>}.
+    """
+    trackers: Dict[str, ConcurrencyTracker] = {}
+    pollers = []
+    for spec in queues:
+        overrides = {key: value for key, value in spec.items() if key not in ("profile", "name", "queue_url", "state_machine_arn")}
+        profile = build_profile(spec["profile"], overrides)
+        arn = spec["state_machine_arn"]
+        if arn not in trackers:
+            trackers[arn] = ConcurrencyTracker(arn, int(profile["max_concurrency"]),
+                                               resync_margin=int(profile["batch_size"]))
+        pollers.append(QueuePoller(spec.get("name", spec["profile"]), profile, spec["queue_url"], trackers[arn]))
+    return pollers
+
+
+def single_queue_spec(profile_name: str) -> Dict[str, Any]:
+    """
+    Queue spec for the classic one-queue poller Lambdas, read from
+    SQS_QUEUE_URL / STEP_FUNCTION_ARN and the optional BATCH_SIZE,
+    MAX_CONCURRENCY and MESSAGES_PER_EXECUTION overrides.
+    """
+    spec = {
+        "profile": profile_name,
+        "queue_url": os.environ['SQS_QUEUE_URL'],
+        "state_machine_arn": os.environ['STEP_FUNCTION_ARN'],
+    }
+    for env_name, key in (('BATCH_SIZE', 'batch_size'), ('MAX_CONCURRENCY', 'max_concurrency'),
+                          ('MESSAGES_PER_EXECUTION', 'messages_per_execution')):
+        if os.environ.get(env_name):
+            spec[key] = int(os.environ[env_name])
+    return spec
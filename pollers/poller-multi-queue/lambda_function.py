@@ -0,0 +1,29 @@
+"""
+AWS Lambda function for polling several SQS queues in one invocation.
+
+Runs the same loop as the single-queue pollers (see poller_engine.py) for
+every queue listed in POLLER_QUEUES. When GLOBAL_MAX_CONCURRENCY is set, the
+free execution slots are shared between queues by weight each round, so a
+large checker backlog cannot starve the lister or crawler queues.
+
+Environment Variables Required:
+- POLLER_QUEUES: JSON list of queue specs, e.g.
+  [{"profile": "lambda-lister", "queue_url": "...", "state_machine_arn": "...", "weight": 2},
+   {"profile": "lambda-checker", "queue_url": "...", "state_machine_arn": "...", "max_concurrency": 100}]
+  "profile" is a key of poller_engine.PROFILES; any profile field can be overridden per queue.
+- GLOBAL_MAX_CONCURRENCY (optional): Running executions allowed across all listed state machines
+- CONCURRENCY_RESYNC_SECONDS, POLL_INTERVAL_SECONDS, MAX_BACKOFF_SECONDS (optional): as for the single-queue pollers
+"""
+
+import os
+import json
+
+from poller_engine import build_pollers, run_pollers
+
+POLLER_QUEUES = json.loads(os.environ['POLLER_QUEUES'])
+GLOBAL_MAX_CONCURRENCY = int(os.environ['GLOBAL_MAX_CONCURRENCY']) if os.environ.get('GLOBAL_MAX_CONCURRENCY') else None
+
+
+def lambda_handler(event, context):
+    pollers = build_pollers(POLLER_QUEUES)
+    return run_pollers(pollers, global_max_concurrency=GLOBAL_MAX_CONCURRENCY)
@@ -1,13 +1,13 @@
 import requests
 import re
 import json
+import os
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
 from dateutil.parser import parse
 from datetime import datetime
 import logging
+from app.browser_pool import BrowserPool
 
 
 venue_url = "https://app.spektrix-link.com/clients/athenstheatre/eventsView.json"
@@ -30,6 +30,30 @@ AREA_MAP = {
 
 logger = logging.getLogger(__name__)
 
+# Seat-data script embedded in the ChooseSeats page
+SEAT_DATA_RE = re.compile(r'seatData["\']?\s*:\s*["\']([^"\']+)["\']', re.DOTALL)
+
+# Upper bound on waiting for the seating page to become ready (was a fixed 20s sleep)
+SEAT_WAIT_SECONDS = float(os.getenv("ATHENS_SEAT_WAIT_SECONDS", "20"))
+# How long a loaded page may go without seat data before it is treated as GA / seatless
+SEAT_GRACE_SECONDS = float(os.getenv("ATHENS_SEAT_GRACE_SECONDS", "5"))
+SEAT_POLL_SECONDS = 0.25
+
+# How seating pages are loaded:
+#   "http"      - plain HTTP fetch, Selenium only when the response has no seat data (default)
+#   "http_only" - plain HTTP fetch only; selenium need not be installed (Lambda runtime)
+#   "browser"   - Selenium only
+SEAT_FETCH_MODE = os.getenv("ATHENS_SEAT_FETCH_MODE", "http").lower()
+SEAT_FETCH_TIMEOUT = float(os.getenv("ATHENS_SEAT_FETCH_TIMEOUT", "15"))
+SEATING_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+# Keep-alive session for the ChooseSeats pages
+seating_session = requests.Session()
+seating_session.headers.update(SEATING_HEADERS)
+
 def get_current_timestamp():
     return time.strftime("%d %b %Y %H:%M:%S", time.localtime())
 ##############################################
@@ -156,42 +180,115 @@ def extract_price(text):
     return price
 
 
-import tempfile
-import uuid
+def get_seating_url(instance_id):
+    return f"https://tickets.athensdeland.com/athenstheatre/website/ChooseSeats.aspx?EventInstanceId={instance_id}&culture=en-US&resize=true"
+
+
+def fetch_seating_html(instance_id, venue):
+    """
+    Fetch the ChooseSeats page with a plain HTTP request; the seatData script
+    is part of the server response, so no browser is needed when it is there.
+    Returns "" on failure.
+    """
+    seating_url = get_seating_url(instance_id)
+    try:
+        response = seating_session.get(seating_url, timeout=SEAT_FETCH_TIMEOUT)
+        if response.status_code != 200:
+            raise Exception(f"Status code: {response.status_code}")
+        return response.text
+    except Exception as e:
+        print(f"An exception has occurred while fetching seat html: {e}")
+        current_time = get_current_timestamp()
+        print(f"{current_time} | NA | {venue} | NA | NA | NA | NA | An exception has occurred while fetching seat html: {e}")
+        return ""
+
+
+def load_seating_html(instance_id, venue):
+    """
+    Load the seating page according to SEAT_FETCH_MODE: HTTP first, and the
+    Selenium browser only when the HTTP response has no seat data.
+    Returns (seating_url, html, instance_id) like get_seating_html.
+    """
+    html = ""
+    if SEAT_FETCH_MODE != "browser":
+        html = fetch_seating_html(instance_id, venue=venue)
+        if SEAT_DATA_RE.search(html):
+            logger.info("Seat data for %s loaded over HTTP", instance_id)
+            return get_seating_url(instance_id), html, instance_id
+        if SEAT_FETCH_MODE == "http_only":
+            return get_seating_url(instance_id), html, instance_id
+        logger.info("No seat data in HTTP response for %s, loading the page in the browser", instance_id)
+
+    seating_url, browser_html, instance_id = get_seating_html(instance_id, venue=venue)
+    return seating_url, browser_html or html, instance_id
+
+
+def seating_page_ready(loaded_at, grace_seconds=SEAT_GRACE_SECONDS):
+    """
+    WebDriverWait condition: the seat-data script is in the page, or the
+    document has finished loading and ``grace_seconds`` have passed since
+    ``loaded_at`` without it (GA / seatless pages).
+    """
+    def ready(driver):
+        if SEAT_DATA_RE.search(driver.page_source):
+            return True
+        if time.monotonic() - loaded_at < grace_seconds:
+            return False
+        return driver.execute_script("return document.readyState") == "complete"
+    return ready
+
+
+def start_chrome(profile_dir):
+    """
+    Start the headless Chrome used for seating pages, with its own user data dir.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    # Return from get() at DOMContentLoaded; readiness is checked in get_seating_html
+    options.page_load_strategy = "eager"
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    return webdriver.Chrome(options=options)
+
+
+# Browsers are started once per container and reused across performances
+browser_pool = BrowserPool(start_chrome)
+
+
 def get_seating_html(instance_id, venue):
     """
     Use the given numeric instance_id to build the seating URL,
     and use Selenium to retrieve the fully rendered HTML.
     """
-    seating_url = f"https://tickets.athensdeland.com/athenstheatre/website/ChooseSeats.aspx?EventInstanceId={instance_id}&culture=en-US&resize=true"
+    seating_url = get_seating_url(instance_id)
     html = ""
-    driver = None
 
     try:
-        options = Options()
-        options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--blink-settings=imagesEnabled=false")
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
 
-        # ✅ Fix: Create a unique user data dir every time
-        unique_dir = tempfile.mkdtemp(prefix=f"chrome-user-data-{uuid.uuid4()}")
-        options.add_argument(f"--user-data-dir={unique_dir}")
+        with browser_pool.session() as driver:
+            driver.get(seating_url)
 
-        driver = webdriver.Chrome(options=options)
-        driver.get(seating_url)
-
-        time.sleep(20)  # Optional: Replace with WebDriverWait
+            started = time.monotonic()
+            try:
+                WebDriverWait(driver, SEAT_WAIT_SECONDS, poll_frequency=SEAT_POLL_SECONDS).until(
+                    seating_page_ready(started))
+            except TimeoutException:
+                logger.info("Seating page for %s not ready after %ss, using current source", instance_id, SEAT_WAIT_SECONDS)
+            logger.info("Seating page for %s ready in %.1fs", instance_id, time.monotonic() - started)
 
-        html = driver.page_source
+            html = driver.page_source
 
     except Exception as e:
         print(f"An exception has occurred while getting seat html: {e}")
         current_time = get_current_timestamp()
         print(f"{current_time} | NA | {venue} | NA | NA | NA | NA | An exception has occurred while getting seat html: {e}")
-    finally:
-        if driver:
-            driver.quit()
     return seating_url, html, instance_id
 
 def extract_event_info(html, venue):
@@ -353,7 +450,7 @@ def scrape_seat_data(html, venue):
     """
     parsed_records = []
     try:
-        match = re.search(r'seatData["\']?\s*:\s*["\']([^"\']+)["\']', html, re.DOTALL)
+        match = SEAT_DATA_RE.search(html)
         if not match:
             print("seatData not found in the page source.")
             return None
@@ -466,7 +563,7 @@ def get_seats(event_json, venue):
         for instance in instances:
             instance_id = instance.get("Instance ID", "")
             if instance_id:
-                seating_url, html, numeric_id = get_seating_html(instance_id, venue=venue)
+                seating_url, html, numeric_id = load_seating_html(instance_id, venue=venue)
                 if html is None:
                     continue
                 general_price = get_general_admission_price(html, venue=venue)
@@ -486,20 +583,22 @@ def get_seats(event_json, venue):
     return seats
 
 
-def get_ga_seats(show_id: str, venue: str, event_obj: dict) -> list[dict]:
+def get_ga_seats(show_id: str, venue: str, event_obj: dict, html: str = "") -> list[dict]:
     """
     Fallback: scrape GA price & qty for a single EventInstanceId.
+    ``html`` is the already loaded ChooseSeats page, if any.
     """
     from datetime import datetime, timezone   # ✅ ensure timezone is in scope
     url  = f"https://tickets.athensdeland.com/athenstheatre/website/ChooseSeats.aspx?EventInstanceId={show_id}&culture=en-US&resize=true"
     hdrs = {"User-Agent":
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"}
 
-    try:
-        html = requests.get(url, headers=hdrs, timeout=15).text
-    except Exception as exc:
-        logger.warning("GA page fetch failed for %s: %s", show_id, exc)
-        return []
+    if not html:
+        try:
+            html = requests.get(url, headers=hdrs, timeout=15).text
+        except Exception as exc:
+            logger.warning("GA page fetch failed for %s: %s", show_id, exc)
+            return []
 
     price_m = re.search(r"\$(\d+(?:\.\d+)?)", html)
     qty_m   = re.search(r"(?:max(?:imum)?|available)\s*(\d+)", html, re.I)
@@ -545,11 +644,10 @@ def scrape_event(venue_name, event_unique_id):
             raise Exception("Invalid event unique id format.")
         performance_id, event_name, event_date, event_time = parts[0], parts[1], parts[2], parts[3]
         
-        seating_url = f"https://tickets.athensdeland.com/athenstheatre/website/ChooseSeats.aspx?EventInstanceId={performance_id}&culture=en-US&resize=true"
-        # Load the seating page via Selenium
+        # Load the seating page over HTTP, or via Selenium when that has no seat data
         html = None
         try:
-            seating_url, html, numeric_id = get_seating_html(performance_id, venue=venue_name)
+            seating_url, html, numeric_id = load_seating_html(performance_id, venue=venue_name)
         except Exception as e:
             raise Exception(f"Error loading seating page: {e}")
         
@@ -563,7 +661,8 @@ def scrape_event(venue_name, event_unique_id):
             seats_data = map_seat_records(raw_records, venue_name, event_name, event_date, event_time, seating_url, general_price, numeric_id=numeric_id)
         else:
             logger.info("No seat data found. Trying GA fallback.")
-            seats_data = get_ga_seats(performance_id, venue_name, {"event_name": event_name, "event_date": event_date, "event_time": event_time})
+            seats_data = get_ga_seats(performance_id, venue_name, {"event_name": event_name, "event_date": event_date, "event_time": event_time},
+                                      html=html)
             
         if not seats_data:
             raise Exception("No seats processed")
@@ -1,6 +1,14 @@
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from app import lambda_function
+from app.athens_scraper import browser_pool
+
+def run_payload(event):
+    # Enclose event in {"parsed": event}
+    response = lambda_function.lambda_handler({"parsed": event}, context=None)
+    print("Lambda-style response:", response)
+    return response
 
 def main():
     payload = os.getenv("PAYLOAD", "{}")
@@ -9,11 +17,14 @@ def main():
         event = json.loads(payload)
     except json.JSONDecodeError:
         raise ValueError("Invalid PAYLOAD format")
-     # Enclose event in {"parsed": event}
-    event = {"parsed": event}
-    print("Running in Fargate mode...")
-    response = lambda_function.lambda_handler(event, context=None)
-    print("Lambda-style response:", response)
+    # A list of events is scraped in one task, sharing the warm browsers
+    events = event if isinstance(event, list) else [event]
+    print(f"Running in Fargate mode with {len(events)} event(s), {browser_pool.size} browser(s)...")
+    try:
+        with ThreadPoolExecutor(max_workers=browser_pool.size) as executor:
+            list(executor.map(run_payload, events))
+    finally:
+        browser_pool.close()
 
 if __name__ == "__main__":
 
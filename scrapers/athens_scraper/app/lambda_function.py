@@ -4,12 +4,13 @@ import os
 import logging
 import sys
 import pandas as pd
-from datetime import datetime
-from sqlalchemy import create_engine, MetaData, update
 from app.read_config import read_config
 from app.athens_scraper import scrape_event
 from app.orchestrator_api import add_item_to_queue_with_bucket
 from app.error_logger import log_error_to_db
+from app.sink_pipeline import run_sinks
+from app.scraper_data_writer import write_scraper_data
+from app.db_engine import get_engine, mark_being_processed, reset_being_processed, increment_error_count
 
 # from read_config import read_config
 # from athens_scraper import scrape_event
@@ -43,52 +44,20 @@ DB_HOST     = os.getenv("DB_HOST")
 DB_PORT     = os.getenv("DB_PORT")
 DB_NAME     = os.getenv("DB_NAME")
 bucket_name = os.getenv("BucketName")
+ENGINE_URL  = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
 
-def save_eventData_to_db(response_body: str) -> None:
-    payload = json.loads(response_body)
-    rows = payload.get("event_data", [])
-    logger.info("Saving scraped_Data event_data sample: %s", rows[:1])
+def save_eventData_to_db(records: list) -> None:
+    logger.info("Saving scraped_Data event_data sample: %s", records[:1])
 
-    df = pd.DataFrame(rows)
-    if df.empty:
-        logger.info("DataFrame is empty — no seats to persist.")
+    if not records:
+        logger.info("No seat records — no seats to persist.")
         return
 
-    if "event_date" in df.columns:
-        df["event_date"] = pd.to_datetime(df["event_date"], format="%Y-%m-%d", errors="coerce")
-
-    if "event_time" in df.columns:
-        def _norm(t):
-            try:
-                return datetime.strptime(t, "%H:%M:%S").strftime("%H:%M:%S")
-            except Exception:
-                return None
-        df["event_time"] = df["event_time"].astype(str).apply(_norm)
-
-    if "price" in df.columns:
-        df["price"] = pd.to_numeric(df["price"], errors="coerce")
-
-    if "row" in df.columns:
-        df["row"] = df["row"].astype(str).str.replace(r"^Row:\s*", "", regex=True).str.strip()
-
-    if "seat_no" in df.columns:
-        df["seat_no"] = pd.to_numeric(df["seat_no"], errors="coerce").fillna(0).astype(int)
-
-    # Add timestamp processing
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], format="%d %b %Y %H:%M:%S", errors="coerce")
-        df["timestamp"] = df["timestamp"].fillna(pd.Timestamp.now())        
-
-    if "uniqueidentifier" in df.columns:
-        df = df.rename(columns={"uniqueidentifier": "unique_id"})
-
-    engine = create_engine(
-        f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    )
+    engine = get_engine(ENGINE_URL)
     try:
-        df.to_sql("scraper_data", engine, if_exists="append", index=False, chunksize=500)
-        logger.info("Saved %s rows to scraper_data", len(df))
+        saved = write_scraper_data(engine, records)
+        logger.info("Saved %s rows to scraper_data", saved)
     except Exception as e:
         logger.exception("Failed to write to MySQL: %s", e)
 
@@ -99,8 +68,8 @@ def save_eventData_to_db(response_body: str) -> None:
         event_date = None
         event_time = None
 
-        if not df.empty:
-            first_row = df.iloc[0].to_dict()
+        if records:
+            first_row = records[0]
             venue_name = first_row.get("venue_name")
             event_name = first_row.get("event_name") 
             event_id = first_row.get("event_id")
@@ -116,6 +85,7 @@ def save_eventData_to_db(response_body: str) -> None:
            event_time=event_time,
            error_details=str(e), 
            process_name="save_eventData_to_db")
+        raise
 
 # ─── Helper to handle scrape/no-data failures ────────────────────────────────
 def handle_failure(engine, err, process, venue_name, venue_id, evt_name, evt_date, evt_time, event_num):
@@ -137,12 +107,7 @@ def handle_failure(engine, err, process, venue_name, venue_id, evt_name, evt_dat
                     evt_date, evt_time, str(err), process)
 
     if process in ("lister", "checker"):
-        metadata = MetaData()
-        metadata.reflect(bind=engine)
-        table = metadata.tables["events_to_process"]       
-
-        with engine.begin() as conn:
-                conn.execute(update(table).where(table.c.event_id == event_num).values(error_count = table.c.error_count + 1))
+        increment_error_count(engine, event_num)
 
         try:
             add_item_to_queue_with_bucket(payload, process, bucket_name)
@@ -183,8 +148,7 @@ def lambda_handler(event, context):
         event_num = int(str(skybox_id).split("_")[-1]) if "_" in str(skybox_id) else int(skybox_id)
 
         # ─── DB connection ─────────────────────────────────────────────────
-        engine_url = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-        engine = create_engine(engine_url)
+        engine = get_engine(ENGINE_URL)
 
         # ─── Scraping block (inner try) ────────────────────────────────────
         try:
@@ -252,32 +216,29 @@ def lambda_handler(event, context):
 
         # ─── Queue & DB Update ─────────────────────────────────────────────
         if process in ("lister", "checker"):
-            metadata = MetaData()
-            metadata.reflect(bind=engine)
-            table = metadata.tables["events_to_process"]
-
             # mark as processing
-            with engine.begin() as conn:
-                conn.execute(update(table).where(table.c.event_id == event_num).values(is_being_processed=1))
+            mark_being_processed(engine, event_num)
 
-            try:
-                add_item_to_queue_with_bucket(payload, process, bucket_name)
-                logger.info("Successfully added payload to %s queue", process)
+        # Enqueue and save seat data concurrently; each sink reports its own outcome
+        records = payload["event_data"]
+        sinks = {"scraper_data": lambda: save_eventData_to_db(records)}
+        if process in ("lister", "checker"):
+            sinks["orchestrator"] = lambda: add_item_to_queue_with_bucket(payload, process, bucket_name)
+        outcomes = run_sinks(sinks)
 
-            except Exception as queue_err:
+        if process in ("lister", "checker"):
+            if outcomes["orchestrator"]["ok"]:
+                logger.info("Successfully added payload to %s queue", process)
+            else:
+                queue_err = outcomes["orchestrator"]["error"]
                 logger.error("Failed to add payload to queue: %s", queue_err)
 
                 # rollback status
-                with engine.begin() as conn:
-                    conn.execute(update(table).where(table.c.event_id == event_num).values(is_being_processed=0))
-                    # conn.execute(update(table).where(table.c.event_id == event_num).values(is_being_processed=0, in_sqs = 0, error_count = table.c.error_count + 1))
+                reset_being_processed(engine, event_num)
 
                 log_error_to_db(engine, venue_name, str(venue_id), evt_name, str(event_num),
                                 evt_date, evt_time, str(queue_err), process)
 
-        # save seat data
-        save_eventData_to_db(json.dumps({ "event_data": df.to_dict(orient="records") }))
-
         return {"statusCode": 200, "body": payload, "headers": {"Content-Type": "application/json"}}
 
     except Exception as e:
@@ -303,9 +264,6 @@ def lambda_handler(event, context):
         }
 
         if process in ("lister", "checker"):
-            metadata = MetaData()
-            metadata.reflect(bind=engine)
-            table = metadata.tables["events_to_process"]            
             try:
                 add_item_to_queue_with_bucket(payload, process, bucket_name)
                 logger.info("Successfully added error payload into %s queue", process)
@@ -313,9 +271,7 @@ def lambda_handler(event, context):
                 logger.error("Failed to add error payload to queue: %s", qe)
 
                 # rollback status
-                with engine.begin() as conn:
-                    conn.execute(update(table).where(table.c.event_id == event_num).values(is_being_processed=0))
-                    # conn.execute(update(table).where(table.c.event_id == event_num).values(is_being_processed=0, in_sqs = 0, error_count = table.c.error_count + 1))
+                reset_being_processed(engine, event_num)
                 if engine:
                     log_error_to_db(engine, venue_name, str(venue_id), evt_name, str(event_num),
                                     evt_date, evt_time, str(qe), process)
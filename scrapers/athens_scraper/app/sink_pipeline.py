@@ -0,0 +1,42 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def run_sinks(sinks: Dict[str, Callable[[], Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Run independent output sinks (e.g. Orchestrator enqueue, scraper_data
+    insert) concurrently and wait for all of them.
+
+    A failing sink does not affect the others; its exception is captured
+    rather than raised. Every outcome is logged.
+
+    Args:
+        sinks: Sink name -> zero-argument callable
+
+    Returns:
+        Sink name -> {"ok": bool, "result": return value, "error": exception or None, "seconds": float}
+    """
+    def timed(func):
+        started = time.perf_counter()
+        try:
+            return {"ok": True, "result": func(), "error": None, "seconds": time.perf_counter() - started}
+        except Exception as e:
+            return {"ok": False, "result": None, "error": e, "seconds": time.perf_counter() - started}
+
+    if not sinks:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=len(sinks)) as executor:
+        futures = {name: executor.submit(timed, func) for name, func in sinks.items()}
+        outcomes = {name: future.result() for name, future in futures.items()}
+
+    for name, outcome in outcomes.items():
+        if outcome["ok"]:
+            logger.info("[run_sinks] %s succeeded in %.2fs", name, outcome["seconds"])
+        else:
+            logger.error("[run_sinks] %s failed after %.2fs: %s", name, outcome["seconds"], outcome["error"])
+    return outcomes
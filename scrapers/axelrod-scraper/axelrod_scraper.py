@@ -7,6 +7,7 @@ from datetime import datetime
 from dateutil import parser
 from datetime import datetime
 import random
+from seat_batch import SeatBatch, dumps_result
 
 client_id = "35486"
 
@@ -236,7 +237,8 @@ def get_seats(client_id, performance_id, venue, event):
     Returns:
         list: List of seat dictionaries with pricing and location information
     """
-    all_seats = []
+    all_seats = SeatBatch(venue, event.get("event_name", ""), event.get("event_date", ""),
+                          event.get("event_time", ""), performance_id)
     
     logger.info(f"Fetching seats for performance {performance_id} at {venue}")
     
@@ -268,11 +270,6 @@ def get_seats(client_id, performance_id, venue, event):
             logger.info("Successfully fetched seating chart data")
             data = response.json()
 
-            # Extract event details from the event parameter
-            event_name = event.get("event_name", "")
-            event_date = event.get("event_date", "")
-            event_time = event.get("event_time", "")
-
             # Build price lookup dictionary from priceLevels
             price_levels = data.get("priceLevels", {})
             price_dict = {}
@@ -360,22 +357,8 @@ def get_seats(client_id, performance_id, venue, event):
                                         logger.debug(f"Skipping seat {section_name}-{seat_row}-{seat_number} with invalid price")
                                         continue
                                     
-                                    # Build seat record
-                                    seat_record = {
-                                        "Venue Name": venue,
-                                        "Event Name": event_name,
-                                        "Event Date": event_date,
-                                        "Event Time": event_time,
-                                        "Section": section_name,
-                                        "Row": seat_row.strip().replace("Row:", "").strip(),
-                                        "Seat": str(seat_number),
-                                        "Price": price,
-                                        "Desc": "",  # Description field for additional seat info
-                                        "UniqueIdentifier": performance_id,
-                                        "TimeStamp": time.strftime("%d %b %Y %H:%M:%S", time.localtime())
-                                    }
-                                    
-                                    all_seats.append(seat_record)
+                                    all_seats.add(section_name, seat_row.strip().replace("Row:", "").strip(),
+                                                  str(seat_number), price)
                                     available_seats_found += 1
                                     
                                     logger.debug(f"Added seat: {section_name}-{seat_row}-{seat_number} @ ${price}")
@@ -459,7 +442,8 @@ def get_ga_seats(client_id, performance_id, venue, event):
     Fetch general admission (GA) seat data for events with simple seat selection.
 
     """
-    seat_data = []
+    seat_data = SeatBatch(venue, event.get("event_name", ""), event.get("event_date", ""),
+                          event.get("event_time", ""), performance_id)
     logger.info(f"Fetching GA seats for performance {performance_id} at {venue}")
     
     try:
@@ -472,11 +456,6 @@ def get_ga_seats(client_id, performance_id, venue, event):
 
         logger.info("Processing GA seat data from event details")
         
-        # Extract event details
-        event_name = event.get("event_name", "")
-        event_date = event.get("event_date", "")
-        event_time = event.get("event_time", "")
-        
         # Extract pricing information from event data
         price_including_fees = 0
         ga_max_tickets = 4  # Default maximum tickets for GA events
@@ -514,20 +493,8 @@ def get_ga_seats(client_id, performance_id, venue, event):
         logger.info(f"Creating {max_tickets} GA seat records at ${price_including_fees} each")
         
         for i in range(1, max_tickets + 1):
-            ga_seat = {
-                "Venue Name": venue,
-                "Event Name": event_name,
-                "Event Date": event_date,
-                "Event Time": event_time,
-                "Section": "General Admission",
-                "Row": "GA",
-                "Seat": str(i),  # Sequential numbering for GA seats
-                "Price": price_including_fees,
-                "Desc": "General Admission",
-                "UniqueIdentifier": performance_id,
-                "TimeStamp": time.strftime("%d %b %Y %H:%M:%S", time.localtime())
-            }
-            seat_data.append(ga_seat)
+            # Sequential numbering for GA seats
+            seat_data.add("General Admission", "GA", str(i), price_including_fees, "General Admission")
             logger.debug(f"Added GA seat {i}")
         
         logger.info(f"Successfully created {len(seat_data)} GA seat records")
@@ -636,7 +603,7 @@ def scrape_event(venue_url, performance_id, venue_name):
         success_message = f"Successfully scraped {len(seats_data)} seats"
         logger.info(success_message)
         
-        return json.dumps({
+        return dumps_result({
             "status": "success",
             "event_data": seats_data,
             "message": success_message
@@ -646,7 +613,7 @@ def scrape_event(venue_url, performance_id, venue_name):
         error_msg = f"Exception occurred while scraping event: {str(e)}"
         logger.error(error_msg)
         
-        return json.dumps({
+        return dumps_result({
             "status": "error",
             "event_data": seats_data,
             "message": error_msg
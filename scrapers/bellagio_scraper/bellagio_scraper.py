@@ -1,10 +1,16 @@
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import os
+import time
 import requests
 import re
-from datetime import datetime
+from rate_limiter import HostRateLimiter
 from dateutil import parser
 import re
 import json
+from seat_batch import SeatBatch, dumps_result
+from seat_filter import keyword_filter
 
 PROPERTY_ID = "44e610ab-c209-4232-8bb4-51f7b9b13a75"
 
@@ -14,8 +20,26 @@ SERVICE_TAX_MULTIPLIER = 0.09
 
 MAX_RETRY_COUNT = 3
 
+# Show details rarely change; keep them per container instead of refetching per scrape
+CATALOG_TTL_SECONDS = int(os.environ.get("BELLAGIO_CATALOG_TTL_SECONDS", 3600))
+
+# event_id -> (expires_at, show details)
+_catalog_cache = {}
+
+# show_id -> event_id, for shows seen earlier in this container
+_show_index = {}
+
+_EVENT_URL_RE = re.compile(r"/book-show/([^/?#]+)/seats")
+
 AUTH_TOKEN = ""
 
+# Per-show GraphQL calls run on a bounded pool, rate limited per host
+MGM_MAX_WORKERS = int(os.environ.get("MGM_MAX_WORKERS", 8))
+MGM_REQUESTS_PER_SECOND = float(os.environ.get("MGM_REQUESTS_PER_SECOND", 10))
+
+_rate_limiter = HostRateLimiter(MGM_REQUESTS_PER_SECOND)
+_token_lock = threading.Lock()
+
 venue_url = "https://api.mgmresorts.com/graphql-next"
 base_url = "https://mandalaybay.mgmresorts.com/book-show/{}/seats/?event={}"
 
@@ -50,11 +74,25 @@ def get_auth_token():
     except Exception as e:
         print("An exception has occurred while fetching auth token."+str(e))
 
+def refresh_auth_token(stale_token):
+    """
+    Fetch a new AUTH_TOKEN after a 401, unless another thread has already
+    replaced ``stale_token`` - concurrent 401s refresh the token once.
+    """
+    with _token_lock:
+        if AUTH_TOKEN == stale_token:
+            get_auth_token()
+
+def mgm_post(url, **kwargs):
+    _rate_limiter.wait(url)
+    return requests.post(url, **kwargs)
+
 def get_events():
     retry_count = 0
 
     try:
         while retry_count < MAX_RETRY_COUNT:
+            used_token = AUTH_TOKEN
             events_list = []
             # url = "https://api.mgmresorts.com/graphql-next"
 
@@ -68,7 +106,7 @@ def get_events():
                 "Sec-Fetch-Site": "same-site",
                 "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Mobile Safari/537.36",
                 "accept": "*/*",
-                "authorization": f"Bearer {AUTH_TOKEN}",
+                "authorization": f"Bearer {used_token}",
                 "content-type": "application/json",
                 "x-mgm-channel": "web",
                 "x-mgm-source": "mgmri"
@@ -94,7 +132,7 @@ def get_events():
                 "query": "query SearchCategory($params: CategorySearchParams!) {\n  searchCategory(params: $params) {\n    total\n    fusionQueryId\n    results {\n      id\n      coverImage {\n        alt\n        src\n        __typename\n      }\n      bookingURL\n      targetURL\n      name\n      detailA\n      detailB\n      detailC\n      detailD\n      open\n      __typename\n    }\n    facetFields {\n      name\n      value {\n        key\n        occurrences\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}"
             }
 
-            response = requests.post(venue_url, headers=headers, json=data)
+            response = mgm_post(venue_url, headers=headers, json=data)
 
             if response.status_code == 200:
                 events_json_data = response.json()
@@ -122,7 +160,7 @@ def get_events():
             elif response.status_code == 401:
                 retry_count += 1
                 print("Auth token expired. Retrying...")
-                get_auth_token()    
+                refresh_auth_token(used_token)
             else:
                 print(f"Request to fetch events failed with status code {response.status_code}")
                 raise Exception(f"Request to fetch events failed with status code {response.status_code}")
@@ -139,6 +177,7 @@ def get_shows(event, start_date, end_date):
 
     try:
         while retry_count < MAX_RETRY_COUNT:
+            used_token = AUTH_TOKEN
             shows_list = []
             event_id = event.get("event_id","")
             event_name = event.get("event_name","")
@@ -157,7 +196,7 @@ def get_shows(event, start_date, end_date):
                 "Sec-Fetch-Mode": "cors",
                 "Sec-Fetch-Site": "same-site",
                 "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Mobile Safari/537.36",
-                "authorization": f"Bearer {AUTH_TOKEN}",
+                "authorization": f"Bearer {used_token}",
                 "x-mgm-channel": "web",
                 "x-mgm-source": PROPERTY_ID
             }
@@ -190,7 +229,7 @@ def get_shows(event, start_date, end_date):
                 "operationName": "GetEventsAvailabilityForShow"
             }
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = mgm_post(url, headers=headers, json=payload)
 
             if response.status_code == 200:
                 print("Request to fetch shows is successfull.")
@@ -222,7 +261,7 @@ def get_shows(event, start_date, end_date):
             elif response.status_code == 401:
                 retry_count += 1
                 print("Auth token expired. Retrying...")
-                get_auth_token()
+                refresh_auth_token(used_token)
 
             else:
                 raise Exception(f"Request to fetch shows failed with status code {response.status_code}")
@@ -234,13 +273,15 @@ def get_shows(event, start_date, end_date):
 
     return shows_list
 
-def get_event_details(event):
+def get_show_details(event):
     retry_count = 0
 
     try:
         while retry_count < MAX_RETRY_COUNT:
+            used_token = AUTH_TOKEN
             service_charge_amount = 0
             seasons_dict = {}
+            show_name = ""
             event_id = event.get("event_id","")
 
             url = "https://api.mgmresorts.com/graphql-next?q=GetShow"
@@ -256,7 +297,7 @@ def get_event_details(event):
                 "Sec-Fetch-Mode": "cors",
                 "Sec-Fetch-Site": "same-site",
                 "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Mobile Safari/537.36",
-                "Authorization": f"Bearer {AUTH_TOKEN}",
+                "Authorization": f"Bearer {used_token}",
                 "x-mgm-channel": "web",
                 "x-mgm-source": PROPERTY_ID
             }
@@ -451,7 +492,7 @@ def get_event_details(event):
                 "operationName": "GetShow"
             }
 
-            response = requests.post(url, headers=headers, json=data)
+            response = mgm_post(url, headers=headers, json=data)
 
             if response.status_code == 200:
                 print("Request to fetch event details is successfull.")
@@ -461,6 +502,8 @@ def get_event_details(event):
 
                 service_charge_amount = show.get("serviceChargeAmount",0)
 
+                show_name = re.sub(r"[^\x00-\x7F]+", "", show.get("name","") or "")
+
                 seasons = show.get("seasons",[])
 
                 seasons_dict = {season.get("id",""): {"max_tickets": season.get("maxTickets",1), "seating_type": season.get("seatMap",{}).get("seatingType","")} for season in seasons}
@@ -470,7 +513,7 @@ def get_event_details(event):
             elif response.status_code == 401:
                 retry_count += 1
                 print("Auth token expired. Retrying...")
-                get_auth_token()
+                refresh_auth_token(used_token)
             else:
                 raise Exception(f"Request to fetch event details failed with status code {response.status_code}")
         else:
@@ -479,16 +522,76 @@ def get_event_details(event):
     except Exception as e:
         print("An exception has occurred while extracting event"+str(e))
 
-    return service_charge_amount, seasons_dict
+    return {"event_name": show_name, "service_charge": service_charge_amount, "seasons": seasons_dict}
+
+def get_event_details(event):
+    details = get_show_details(event)
+    return details["service_charge"], details["seasons"]
+
+def get_catalog_entry(event_id):
+    """
+    Show details (name, service charge, seasons) for an MGM event id, cached
+    per container for CATALOG_TTL_SECONDS. Failed lookups are not cached.
+    """
+    now = time.time()
+    cached = _catalog_cache.get(event_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    details = get_show_details({"event_id": event_id})
+    if details["seasons"]:
+        _catalog_cache[event_id] = (now + CATALOG_TTL_SECONDS, details)
+    return details
+
+def parse_event_id(event_url):
+    """MGM event id from a book-show URL built with base_url, or ""."""
+    match = _EVENT_URL_RE.search(event_url or "")
+    return match.group(1) if match else ""
+
+def resolve_target_event(event_unique_id, start_date, end_date, event_url=""):
+    """
+    Look up a single show without walking the property's event list: the MGM
+    event id comes from the event URL (or shows seen earlier in this
+    container), its details from the catalog cache, and only that event's
+    shows are fetched. Returns None when the show cannot be resolved this way.
+    """
+    event_id = parse_event_id(event_url) or _show_index.get(str(event_unique_id), "")
+    if not event_id:
+        return None
+
+    details = get_catalog_entry(event_id)
+    shows = get_shows(event={"event_id": event_id, "event_name": details["event_name"]}, start_date=start_date, end_date=end_date)
+
+    target_event = None
+    for show in shows:
+        _show_index[str(show.get("show_id"))] = event_id
+        if str(show.get("show_id")) == str(event_unique_id):
+            target_event = show
+
+    if not target_event:
+        return None
+
+    season_obj = details["seasons"].get(target_event.get("season_id",""),{})
+    target_event["service_charge"] = details["service_charge"]
+    target_event["seating_type"] = season_obj.get("seating_type","")
+    target_event["max_tickets"] = season_obj.get("max_tickets",1)
+    return target_event
 
 def get_all_events( start_date, end_date):
     all_events_list = []
     try:
         main_events = get_events()
-        for event_obj in main_events:
+
+        # GetShow and GetEventsAvailabilityForShow for every show, issued concurrently
+        with ThreadPoolExecutor(max_workers=MGM_MAX_WORKERS) as pool:
+            details_futures = [pool.submit(get_event_details, event=event_obj) for event_obj in main_events]
+            shows_futures = [pool.submit(get_shows, event=event_obj, start_date=start_date, end_date=end_date)
+                             for event_obj in main_events]
+
+        for event_obj, details_future, shows_future in zip(main_events, details_futures, shows_futures):
             try:
-                service_charge, seasons_dict = get_event_details(event=event_obj)
-                shows = get_shows(event=event_obj, start_date=start_date, end_date=end_date)
+                service_charge, seasons_dict = details_future.result()
+                shows = shows_future.result()
                 if not shows:
                     raise Exception("No shows found.")
                 for show in shows:
@@ -501,6 +604,7 @@ def get_all_events( start_date, end_date):
                         show["max_tickets"] = season_obj.get("max_tickets",1)
 
                         all_events_list.append(show)
+                        _show_index[str(show.get("show_id"))] = event_obj.get("event_id","")
 
                     except Exception as e:
                         print(f"An exception occurred while adding show to all events list: {e}")
@@ -517,6 +621,7 @@ def get_seats_data(event):
 
     try:
         while retry_count < MAX_RETRY_COUNT:
+            used_token = AUTH_TOKEN
             seats_data = {}
             show_id = event.get("show_id","")
             url = "https://api.mgmresorts.com/graphql-next?q=GetSeatsAvailability"
@@ -532,7 +637,7 @@ def get_seats_data(event):
                 "Sec-Fetch-Mode": "cors",
                 "Sec-Fetch-Site": "same-site",
                 "User-Agent": "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Mobile Safari/537.36",
-                "Authorization": f"Bearer {AUTH_TOKEN}",
+                "Authorization": f"Bearer {used_token}",
                 "x-mgm-channel": "web",
                 "x-mgm-source": PROPERTY_ID
             }
@@ -614,7 +719,7 @@ def get_seats_data(event):
                 "operationName": "GetSeatsAvailability"
             }
 
-            response = requests.post(url, headers=headers, json=data)
+            response = mgm_post(url, headers=headers, json=data)
 
             if response.status_code == 200:
                 print("Request to fetch seats data is successfull.")
@@ -623,7 +728,7 @@ def get_seats_data(event):
             elif response.status_code == 401:
                 print("Auth token expired. Retrying...")
                 retry_count += 1
-                get_auth_token()    
+                refresh_auth_token(used_token)
             else:
                 raise Exception(f"Request to fetch seats data failed with status code: {response.status_code}")
         else:
@@ -636,15 +741,37 @@ def get_seats_data(event):
 
     return seats_data
 
+def resolve_seat_prices(price_dict, service_charge):
+    """
+    Final price per price code, with the keyword filter and the tax formula
+    evaluated once per code. Codes whose seats must not be listed are left out.
+    """
+    resolved = {}
+    for price_code, price_obj in price_dict.items():
+        try:
+            price = price_obj.get("price_value",0)
+            price_desc = price_obj.get("price_desc","")
+
+            if keyword_filter("bellagio_price").matches(price_desc):
+                continue
+
+            if price == 0:
+                continue
+
+            if service_charge > 0:
+                price = round(price + service_charge + price*ENTERTAINMENT_TAX_MULTIPLIER + service_charge*SERVICE_TAX_MULTIPLIER ,2)
+
+            resolved[price_code] = price
+        except Exception:
+            continue
+    return resolved
+
 def get_regular_seats(event, venue):
-    regular_seats = []
+    regular_seats = SeatBatch(venue, event.get("event_name",""), event.get("event_date",""),
+                              event.get("event_time",""), event.get("show_id",""))
     price_dict = {}
     try:
 
-        show_id = event.get("show_id","")
-        event_name = event.get("event_name","")
-        event_date = event.get("event_date","")
-        event_time = event.get("event_time","")
         service_charge = event.get("service_charge",0)
 
 
@@ -657,13 +784,15 @@ def get_regular_seats(event, venue):
 
             price_dict = {price.get("code",""): {"available_seats":price.get("totalAvailableSeats",0),"price_desc":price.get("description",0),"price_value":price.get("price",{}).get("basePrice",0), "price_type":price.get("ticketTypeDescription","")} for price in prices}
 
+            resolved_prices = resolve_seat_prices(price_dict, service_charge)
+
             seats_obj = seats_availability.get("seats",[])
 
             for section_obj in seats_obj:
                 try:
                     section_name = section_obj.get("name","")
                     rows = section_obj.get("seatRows",[])
-                    if any(kw in section_name.lower().strip() for kw in ['vip']):
+                    if keyword_filter("bellagio_section").matches(section_name):
                         continue
                     for row in rows:
                         try:
@@ -676,58 +805,22 @@ def get_regular_seats(event, venue):
 
                                     if is_ada or is_companion:
                                         continue
-                                    price_code = seat.get("priceCode","")
-                                    price_obj = price_dict.get(price_code,{})
 
-                                    price = price_obj.get("price_value",0)
-                                    price_desc = price_obj.get("price_desc","")
-
-                                    if any(kw in price_desc.lower().strip() for kw in ['accessible','wheelchair','limited view','companion']):
-                                        continue
-
-                                    if price == 0:
+                                    price = resolved_prices.get(seat.get("priceCode",""))
+                                    if price is None:
                                         continue
 
-                                    if service_charge > 0:
-                                        price = round(price + service_charge + price*ENTERTAINMENT_TAX_MULTIPLIER + service_charge*SERVICE_TAX_MULTIPLIER ,2)
-
                                     num_seats = seat.get("numSeats",0)
 
                                     first_seat = seat.get("firstSeat",0)
                                     last_seat = seat.get("lastSeat",0)
                                     seat_increment = seat.get("seatIncrement",1)
 
+                                    # Seat ranges stay run-length encoded until the output is serialized
                                     if num_seats == 1:
-                                        regular_seats.append({
-                                            "Venue Name": venue,
-                                            "Event Name": event_name,
-                                            "Event Date": event_date,
-                                            "Event Time": event_time,
-                                            "Section": section_name,
-                                            "Row": row_name,
-                                            "Seat": first_seat,
-                                            "Price": price,
-                                            "Desc":"",
-                                            "UniqueIdentifier": show_id,
-                                            "TimeStamp": datetime.now().strftime("%d %b %Y %H:%M:%S")
-
-                                        })
+                                        regular_seats.add(section_name, row_name, first_seat, price)
                                     elif num_seats > 1:
-                                        for seat_num in range(first_seat, last_seat+1, seat_increment):
-                                            regular_seats.append({
-                                                "Venue Name": venue,
-                                                "Event Name": event_name,
-                                                "Event Date": event_date,
-                                                "Event Time": event_time,
-                                                "Section": section_name,
-                                                "Row": row_name,
-                                                "Seat": seat_num,
-                                                "Price": price,
-                                                "Desc":"",
-                                                "UniqueIdentifier": show_id,
-                                                "TimeStamp": datetime.now().strftime("%d %b %Y %H:%M:%S")
-
-                                        })
+                                        regular_seats.add_block(section_name, row_name, range(first_seat, last_seat+1, seat_increment), price)
 
                                     else:
                                         continue
@@ -737,6 +830,8 @@ def get_regular_seats(event, venue):
                             pass
                 except Exception as e:
                     print(f"An exception has occurred while extracting seats from section {section_name}")
+
+            print(f"Extracted {len(regular_seats)} seats in {regular_seats.block_count} blocks")
     except Exception as e:
         print("An exception has occurred while extracting regular seats."+str(e))
 
@@ -744,14 +839,11 @@ def get_regular_seats(event, venue):
     return regular_seats
 
 def get_ga_seats(event, venue):
-    ga_seats = []
+    ga_seats = SeatBatch(venue, event.get("event_name",""), event.get("event_date",""),
+                         event.get("event_time",""), event.get("show_id",""))
     price_dict = {}
     try:
         event_id = event.get("event_id","")
-        show_id = event.get("show_id","")
-        event_name = event.get("event_name","")
-        event_date = event.get("event_date","")
-        event_time = event.get("event_time","")
         service_charge = event.get("service_charge",0)
         seating_type = event.get("seating_type","")
 
@@ -764,7 +856,7 @@ def get_ga_seats(event, venue):
             for price_obj in prices:
                 price_desc = price_obj.get("description","").lower().strip() 
 
-                if any(kw in price_desc for kw in ['general admission','general']):
+                if keyword_filter("bellagio_ga_price").matches(price_desc):
                     if not price_desc in price_dict:
                         price_dict["ga"] = price_obj
                     else:
@@ -790,47 +882,40 @@ def get_ga_seats(event, venue):
             if service_charge > 0:
                 price = round(price + service_charge + price*ENTERTAINMENT_TAX_MULTIPLIER + service_charge*SERVICE_TAX_MULTIPLIER ,2)
 
-            ga_seats.append({
-                "Venue Name": venue,
-                "Event Name": event_name,
-                "Event Date": event_date,
-                "Event Time": event_time,
-                "Section": "General Admission",
-                "Row": "GA",
-                "Seat": "",
-                "Price": price,
-                "Desc": f"{available_seats}-max seats",
-                "UniqueIdentifier": show_id,
-                "TimeStamp": datetime.now().strftime("%d %b %Y %H:%M:%S")
-            })
+            ga_seats.add("General Admission", "GA", "", price, f"{available_seats}-max seats")
 
     except Exception as e:
         print('An exception has occurred while extracting ga seats.'+str(e))
     return ga_seats
 
 
-def scrape_event(venue_name, event_unique_id, start_date, end_date):
+def scrape_event(venue_name, event_unique_id, start_date, end_date, event_url=""):
     global MAX_RETRY_COUNT
     seats_data = []
     try:
         if not event_unique_id:
             raise Exception("Event unique id not provided.")
 
-        get_auth_token()
+        # The token outlives a single scrape; requests refresh it on 401
+        if not AUTH_TOKEN:
+            get_auth_token()
 
         if not AUTH_TOKEN:
             raise Exception("Auth token not found.")
 
-        events = get_all_events(start_date=start_date, end_date=end_date)
+        target_event = resolve_target_event(event_unique_id, start_date, end_date, event_url)
 
-        if not events:
-            raise Exception("No events found.")
-        
-        target_event = None
-        for event in events:
-            if str(event.get("show_id")) == event_unique_id:
-                target_event = event
-                break
+        if not target_event:
+            print("Show not resolved directly, falling back to full event discovery.")
+            events = get_all_events(start_date=start_date, end_date=end_date)
+
+            if not events:
+                raise Exception("No events found.")
+
+            for event in events:
+                if str(event.get("show_id")) == event_unique_id:
+                    target_event = event
+                    break
         
         if not target_event:
             raise Exception(f"Event ID {event_unique_id} not found")
@@ -849,7 +934,7 @@ def scrape_event(venue_name, event_unique_id, start_date, end_date):
         if not seats_data:
             raise Exception("No seats found")
 
-        return json.dumps({
+        return dumps_result({
             "status": "success",
             "message": f"Successfully extracted {len(seats_data)} seats",
             "event_data": seats_data
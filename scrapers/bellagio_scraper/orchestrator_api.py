@@ -3,12 +3,16 @@ import os
 import time
 import logging
 import random
+import threading
 import io
+import zlib
 import uuid
 from datetime import datetime
+from urllib.parse import urlsplit
 from read_config import read_config
 # Import curl cffi
 import requests
+from requests.adapters import HTTPAdapter
 
 # === CONFIGURATION ===
 config = read_config()
@@ -18,6 +22,7 @@ account_logical_name = config.get('ACCOUNT_NAME')
 tenant_logical_name = config.get('TENANT_NAME')
 organization_unit_id = config.get('ORGANIZATION_UNIT_ID')
 bucket_id = config.get('BUCKET_ID')
+bucket_upload_gzip = str(config.get('BUCKET_UPLOAD_GZIP', 'false')).lower() in ('1', 'true', 'yes')
 
 # -- for testing
 # organization_unit_id = "313831"
@@ -34,6 +39,47 @@ orchestrator_url = f'https://cloud.uipath.com/{account_logical_name}/{tenant_log
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Container-level caches: one access token (refreshed shortly before it
+# expires) and the resolved queue IDs, shared by every invocation
+TOKEN_REFRESH_MARGIN_SECONDS = 120
+DEFAULT_TOKEN_LIFETIME_SECONDS = 3600
+_token_cache = {'access_token': None, 'expires_at': 0.0}
+_token_lock = threading.Lock()
+_queue_id_cache = {}
+
+# === HTTP SESSION ===
+# One keep-alive session per container with a connection pool per host, so
+# the token, GetWriteUri, blob PUT and AddQueueItem calls reuse warm TLS
+# connections across calls and warm invocations.
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+http_stats = {}  # host -> {'requests': n, 'new_connections': n}
+_stats_lock = threading.Lock()
+
+def _opened_connections(host):
+    manager = http_session.get_adapter('https://').poolmanager
+    return sum(manager.pools[key].num_connections for key in manager.pools.keys() if key.key_host == host)
+
+def http_request(method, url, **kwargs):
+    """
+    Sends a request through the shared session and records whether it opened a new connection.
+    """
+    host = urlsplit(url).hostname
+    opened = _opened_connections(host)
+    response = http_session.request(method.upper(), url, **kwargs)
+    with _stats_lock:
+        stats = http_stats.setdefault(host, {'requests': 0, 'new_connections': 0})
+        stats['requests'] += 1
+        stats['new_connections'] += _opened_connections(host) - opened
+    return response
+
+def get_connection_stats():
+    """
+    Returns per-host request, new-connection and reused-connection counts since the container started.
+    """
+    with _stats_lock:
+        return {host: dict(stats, reused=stats['requests'] - stats['new_connections']) for host, stats in http_stats.items()}
+
 # Implement enhanced retry logic for curl cffi requests with focus on throttling
 def make_request_with_retry(method, url, headers=None, data=None, json_data=None, 
                            max_retries=5, initial_backoff=1.0, 
@@ -60,12 +106,12 @@ def make_request_with_retry(method, url, headers=None, data=None, json_data=None
     while retries <= max_retries:
         try:
             if method.lower() == 'get':
-                response = requests.get(url, headers=headers)
+                response = http_request('get', url, headers=headers)
             elif method.lower() == 'post':
                 if json_data:
-                    response = requests.post(url, headers=headers, json=json_data)
+                    response = http_request('post', url, headers=headers, json=json_data)
                 else:
-                    response = requests.post(url, headers=headers, data=data)
+                    response = http_request('post', url, headers=headers, data=data)
             else:
                 raise ValueError(f"Unsupported method: {method}")
             
@@ -118,31 +164,54 @@ def make_request_with_retry(method, url, headers=None, data=None, json_data=None
     
     # If we've exhausted retries, make one final attempt and let any exceptions propagate
     if method.lower() == 'get':
-        return requests.get(url, headers=headers)
+        return http_request('get', url, headers=headers)
     elif method.lower() == 'post':
         if json_data:
-            return requests.post(url, headers=headers, json=json_data)
+            return http_request('post', url, headers=headers, json=json_data)
         else:
-            return requests.post(url, headers=headers, data=data)
+            return http_request('post', url, headers=headers, data=data)
 
 # === STEP 1: GET ACCESS TOKEN ===
-def get_access_token():
-    token_url = f'https://cloud.uipath.com/identity_/connect/token'
-    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-    data = {
-        'grant_type': 'client_credentials',
-        'client_id': client_id,
-        'client_secret': client_secret,
-        'scope': 'OR.Administration OR.Queues'
-    }
+def get_access_token(force_refresh=False):
+    """
+    Returns a client-credentials access token, cached for the life of the container.
 
-    response = make_request_with_retry('post', token_url, headers=headers, data=data)
-    print(f"Response: {response.status_code} - {response.text}")
-    response.raise_for_status()
-    return response.json()['access_token']
+    A cached token is reused until TOKEN_REFRESH_MARGIN_SECONDS before its
+    expires_in runs out; force_refresh=True always fetches a new one.
+    """
+    with _token_lock:
+        now = time.time()
+        if not force_refresh and _token_cache['access_token'] and now < _token_cache['expires_at'] - TOKEN_REFRESH_MARGIN_SECONDS:
+            return _token_cache['access_token']
+
+        token_url = f'https://cloud.uipath.com/identity_/connect/token'
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        data = {
+            'grant_type': 'client_credentials',
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'scope': 'OR.Administration OR.Queues'
+        }
+
+        response = make_request_with_retry('post', token_url, headers=headers, data=data)
+        print(f"Response: {response.status_code} - {response.text}")
+        response.raise_for_status()
+        token = response.json()
+        _token_cache['access_token'] = token['access_token']
+        _token_cache['expires_at'] = now + float(token.get('expires_in', DEFAULT_TOKEN_LIFETIME_SECONDS))
+        return _token_cache['access_token']
+
+def is_unauthorized(error):
+    """
+    True if the exception came from a 401 response (raise_for_status on requests or curl_cffi).
+    """
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 401
 
 # === STEP 2: GET QUEUE ID ===
 def get_queue_id(access_token, process):
+    if queue_name[process] in _queue_id_cache:
+        return _queue_id_cache[queue_name[process]]
     url = f'{orchestrator_url}/odata/Queues?$filter=Name eq \'{queue_name[process]}\''
     headers = {'Authorization': f'Bearer {access_token}'}
     res = make_request_with_retry('get', url, headers=headers)
@@ -150,6 +219,7 @@ def get_queue_id(access_token, process):
     queues = res.json()['value']
     if not queues:
         raise Exception(f"Queue '{queue_name[process]}' not found.")
+    _queue_id_cache[queue_name[process]] = queues[0]['Id']
     return queues[0]['Id']
 
 # === STEP 3: ADD QUEUE ITEM WITH RETRY LOGIC ===
@@ -188,8 +258,13 @@ def add_item_to_queue(result, process):
     Wrapper function to get the access token and add a queue item with retry logic.
     """
     try:
-        access_token = get_access_token()
-        return add_queue_item(access_token, result, process)
+        try:
+            return add_queue_item(get_access_token(), result, process)
+        except Exception as e:
+            if not is_unauthorized(e):
+                raise
+            logger.warning("Orchestrator rejected the cached access token, refreshing and retrying once")
+            return add_queue_item(get_access_token(force_refresh=True), result, process)
     except Exception as e:
         logger.error(f"Failed to add item to queue for process '{process}': {str(e)}")
         raise
@@ -216,23 +291,65 @@ def get_write_uri(access_token, bucket_name, file_name):
     response.raise_for_status()
     return response.json()['Uri']
 
+# === BUCKET UPLOAD ENCODING ===
+UPLOAD_CHUNK_BYTES = 64 * 1024
+GZIP_LEVEL = 6
+
+def encode_event_data(json_content, compress=False, chunk_size=UPLOAD_CHUNK_BYTES):
+    """
+    Encodes {"event_data": json_content} as compact JSON into a BytesIO ready for the blob PUT.
+
+    A list is encoded record by record and written in chunk_size pieces, so the
+    document never exists as one str plus a bytes copy. With compress=True each
+    chunk is gzipped as it is written, and only the compressed bytes are kept.
+    The Put Blob call needs a Content-Length, so the body is buffered rather
+    than sent with chunked transfer encoding.
+    """
+    body = io.BytesIO()
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+
+    def write(text):
+        data = text.encode('utf-8')
+        body.write(compressor.compress(data) if compressor else data)
+
+    if isinstance(json_content, list):
+        pending = ['{"event_data":[']
+        pending_size = 0
+        for i, record in enumerate(json_content):
+            piece = json.dumps(record, separators=(',', ':'))
+            pending.append(',' + piece if i else piece)
+            pending_size += len(piece) + 1
+            if pending_size >= chunk_size:
+                write(''.join(pending))
+                pending = []
+                pending_size = 0
+        pending.append(']}')
+        write(''.join(pending))
+    else:
+        write(json.dumps({"event_data": json_content}, separators=(',', ':')))
+
+    if compressor:
+        body.write(compressor.flush())
+    body.seek(0)
+    return body
+
 def upload_json_content_to_bucket(access_token, bucket_name, json_content, file_name):
     """
     Uploads JSON content to a UiPath Orchestrator bucket.
+
+    The body is gzipped (Content-Encoding: gzip) when BUCKET_UPLOAD_GZIP is set in the config.
     """
-    event_data = {
-        "event_data": json_content
-    }
     # Get the write URI
     write_uri = get_write_uri(access_token, bucket_name, file_name)
     headers = {
     'x-ms-blob-type': 'BlockBlob',
     'Content-Type': 'application/json',
     }
-    # Convert JSON content to bytes and upload
-    compact_json = json.dumps(event_data, separators=(',', ':'))
-    with io.BytesIO(compact_json.encode('utf-8')) as file:
-        response = requests.put(write_uri, data=file, headers=headers)
+    if bucket_upload_gzip:
+        headers['Content-Encoding'] = 'gzip'
+    # Encode JSON content chunk by chunk and upload
+    with encode_event_data(json_content, compress=bucket_upload_gzip) as file:
+        response = http_request('put', write_uri, data=file, headers=headers)
         response.raise_for_status()
 
     return f"{bucket_name}/{file_name}"  # Return the bucket file path
@@ -275,6 +392,7 @@ def add_queue_item_with_bucket(access_token, result, process, bucket_name):
         # Use the retry logic for the POST request
         response = make_request_with_retry('post', url, headers=headers, json_data=payload)
         response.raise_for_status()
+        logger.info(f"Orchestrator HTTP connection stats: {get_connection_stats()}")
         return response.json()
     except Exception as e:
         logger.error(f"Failed to add queue item: {str(e)}")
@@ -284,9 +402,18 @@ def add_item_to_queue_with_bucket(result, process, bucket_name):
     """
     Wrapper function to get the access token, upload JSON to bucket, and add a queue item.
     """
+    original = dict(result)
     try:
-        access_token = get_access_token()
-        return add_queue_item_with_bucket(access_token, result, process, bucket_name)
+        try:
+            return add_queue_item_with_bucket(get_access_token(), result, process, bucket_name)
+        except Exception as e:
+            if not is_unauthorized(e):
+                raise
+            logger.warning("Orchestrator rejected the cached access token, refreshing and retrying once")
+            # add_queue_item_with_bucket pops event_data; restore it for the retry
+            result.clear()
+            result.update(original)
+            return add_queue_item_with_bucket(get_access_token(force_refresh=True), result, process, bucket_name)
     except Exception as e:
         logger.error(f"Failed to add item to queue for process '{process}': {str(e)}")
         raise
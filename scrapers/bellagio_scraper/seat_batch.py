@@ -0,0 +1,223 @@
+import json
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Field order of a seat record, as the scrapers have always emitted it
+FIELDS = ("venue", "event_name", "event_date", "event_time", "section", "row",
+          "seat", "price", "desc", "unique_id", "timestamp")
+
+# Record keys expected by the lambdas (display names) ...
+LEGACY_KEYS = {
+    "venue": "Venue Name",
+    "event_name": "Event Name",
+    "event_date": "Event Date",
+    "event_time": "Event Time",
+    "section": "Section",
+    "row": "Row",
+    "seat": "Seat",
+    "price": "Price",
+    "desc": "Desc",
+    "unique_id": "UniqueIdentifier",
+    "timestamp": "TimeStamp",
+}
+
+# ... and the scraper_data column names
+DB_KEYS = {
+    "venue": "venue_name",
+    "event_name": "event_name",
+    "event_date": "event_date",
+    "event_time": "event_time",
+    "section": "section",
+    "row": "row",
+    "seat": "seat_no",
+    "price": "price",
+    "desc": "description",
+    "unique_id": "unique_id",
+    "timestamp": "timestamp",
+}
+
+_PER_SEAT = ("section", "row", "seat", "price", "desc")
+
+
+def current_timestamp() -> str:
+    """Return the current time in the seat record TimeStamp format."""
+    return time.strftime("%d %b %Y %H:%M:%S", time.localtime())
+
+
+class SeatBatch:
+    """
+    Seats of one event, stored column-wise.
+
+    The per-event fields (venue, event name/date/time, unique id, timestamp)
+    are kept once; only section, row, seat, price and description are stored
+    per entry. An entry is either a single seat or a run-length block of
+    seats sharing section, row, price and description, whose seat numbers are
+    a ``range``. Blocks are expanded only when records in the legacy dict
+    shape, a DataFrame or the JSON wire format are produced.
+
+    Args:
+        venue: Venue name
+        event_name: Event name
+        event_date: Event date as emitted by the scraper
+        event_time: Event time as emitted by the scraper
+        unique_id: Value of the UniqueIdentifier field
+        timestamp: Scrape timestamp; defaults to the time the batch is created
+        keys: Field name -> record key mapping (LEGACY_KEYS or DB_KEYS)
+        extra: Additional per-event fields appended after the timestamp
+    """
+
+    __slots__ = ("constants", "keys", "extra", "size", "sections", "rows", "seats", "prices", "descs")
+
+    def __init__(self, venue, event_name, event_date, event_time, unique_id,
+                 timestamp: Optional[str] = None, keys: Dict[str, str] = LEGACY_KEYS,
+                 extra: Optional[dict] = None):
+        self.constants = {
+            "venue": venue,
+            "event_name": event_name,
+            "event_date": event_date,
+            "event_time": event_time,
+            "unique_id": unique_id,
+            "timestamp": timestamp or current_timestamp(),
+        }
+        self.keys = keys
+        self.extra = dict(extra or {})
+        self.size = 0
+        self.sections: List = []
+        self.rows: List = []
+        self.seats: List = []
+        self.prices: List = []
+        self.descs: List = []
+
+    def add(self, section, row, seat, price, desc="") -> None:
+        """Append one seat."""
+        self.sections.append(section)
+        self.rows.append(row)
+        self.seats.append(seat)
+        self.prices.append(price)
+        self.descs.append(desc)
+        self.size += 1
+
+    def add_block(self, section, row, seats: range, price, desc="") -> None:
+        """Append a block of seats, e.g. ``range(first_seat, last_seat + 1, increment)``."""
+        if not seats:
+            return
+        self.sections.append(section)
+        self.rows.append(row)
+        self.seats.append(seats)
+        self.prices.append(price)
+        self.descs.append(desc)
+        self.size += len(seats)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def block_count(self) -> int:
+        """Number of stored entries (single seats and blocks)."""
+        return len(self.seats)
+
+    def iter_rows(self) -> Iterator[tuple]:
+        """Yield (section, row, seat, price, desc) per seat, expanding blocks."""
+        for section, row, seat, price, desc in zip(self.sections, self.rows, self.seats, self.prices, self.descs):
+            if isinstance(seat, range):
+                for number in seat:
+                    yield section, row, number, price, desc
+            else:
+                yield section, row, seat, price, desc
+
+    def __iter__(self) -> Iterator[dict]:
+        """Yield the seats one at a time as legacy-shaped dicts."""
+        keys = self.keys
+        head = {keys[f]: self.constants[f] for f in FIELDS[:4]}
+        tail = {keys["unique_id"]: self.constants["unique_id"], keys["timestamp"]: self.constants["timestamp"]}
+        tail.update(self.extra)
+        names = [keys[f] for f in _PER_SEAT]
+        for values in self.iter_rows():
+            record = dict(head)
+            record.update(zip(names, values))
+            record.update(tail)
+            yield record
+
+    def to_records(self) -> List[dict]:
+        """Return the seats as a list of dicts, identical to the old per-seat output."""
+        return list(self)
+
+    def to_dataframe(self):
+        """Return the seats as a DataFrame; per-event fields are broadcast."""
+        import pandas as pd
+
+        df = pd.DataFrame.from_records(list(self.iter_rows()), columns=[self.keys[f] for f in _PER_SEAT])
+        for field in FIELDS:
+            if field not in _PER_SEAT:
+                df[self.keys[field]] = self.constants[field]
+        for key, value in self.extra.items():
+            df[key] = value
+        return df[[self.keys[f] for f in FIELDS] + list(self.extra)]
+
+    @staticmethod
+    def _encode_column(label: str, column: List) -> List:
+        """``label`` + JSON text per value, encoding each distinct value once; blocks map to None."""
+        memo = {}
+        encoded = []
+        for value in column:
+            if isinstance(value, range):
+                encoded.append(None)
+                continue
+            try:
+                memo_key = (value.__class__, value)
+                text = memo.get(memo_key)
+                if text is None:
+                    text = memo[memo_key] = label + json.dumps(value)
+            except TypeError:
+                text = label + json.dumps(value)
+            encoded.append(text)
+        return encoded
+
+    def to_json(self) -> str:
+        """
+        Return the JSON array ``json.dumps(self.to_records())`` would produce,
+        without building the dicts. Per-event fields are encoded once, each
+        distinct per-seat value once per column, and everything but the seat
+        number once per block.
+        """
+        keys = self.keys
+        enc = json.dumps
+        prefix = "{" + ", ".join(f"{enc(keys[f])}: {enc(self.constants[f])}" for f in FIELDS[:4]) + ", "
+        suffix_items = [(keys["unique_id"], self.constants["unique_id"]),
+                        (keys["timestamp"], self.constants["timestamp"])] + list(self.extra.items())
+        suffix = ", " + ", ".join(f"{enc(k)}: {enc(v)}" for k, v in suffix_items) + "}"
+        labels = [enc(keys[f]) + ": " for f in _PER_SEAT]
+        columns = (self.sections, self.rows, self.seats, self.prices, self.descs)
+        sections, rows, seats, prices, descs = (self._encode_column(label, column)
+                                                for label, column in zip(labels, columns))
+
+        parts = []
+        for section, row, seat, price, desc, raw_seat in zip(sections, rows, seats, prices, descs, self.seats):
+            if seat is None:
+                left = f"{prefix}{section}, {row}, {labels[2]}"
+                right = f", {price}, {desc}{suffix}"
+                parts.extend(f"{left}{number}{right}" for number in raw_seat)
+            else:
+                parts.append(f"{prefix}{section}, {row}, {seat}, {price}, {desc}{suffix}")
+        return "[" + ", ".join(parts) + "]"
+
+
+def dumps_result(result: dict) -> str:
+    """
+    ``json.dumps`` for a scrape_event result whose values may include
+    SeatBatch objects; each batch is written through SeatBatch.to_json.
+    """
+    batches = {}
+    plain = {}
+    for key, value in result.items():
+        if isinstance(value, SeatBatch):
+            marker = f"\x00seat_batch:{key}\x00"
+            batches[json.dumps(marker)] = value
+            plain[key] = marker
+        else:
+            plain[key] = value
+
+    text = json.dumps(plain)
+    for marker, batch in batches.items():
+        text = text.replace(marker, batch.to_json(), 1)
+    return text
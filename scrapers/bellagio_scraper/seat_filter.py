@@ -0,0 +1,82 @@
+import json
+import logging
+import re
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Config entry holding {filter name: [keywords]}; overrides the defaults below
+CONFIG_KEY = "SEAT_FILTER_KEYWORDS"
+
+DEFAULT_KEYWORD_SETS = {
+    # Section / category / special-seating names that are never listed
+    "restricted_seating": ["wheelchair", "companion", "obstructed", "accessible", "standing room only",
+                           "ada seating", "vip", "obstructed view", "partially obstructed view"],
+    # Price code names that are never listed
+    "premium_price": ["vip", "premium"],
+    # Seat notes / descriptions that are never listed
+    "accessible_seat": ["accessible", "wheelchair", "companion", "obstructed"],
+    # Bellagio price descriptions and section names that are never listed
+    "bellagio_price": ["accessible", "wheelchair", "limited view", "companion"],
+    "bellagio_section": ["vip"],
+    # Bellagio price descriptions that mark general admission
+    "bellagio_ga_price": ["general admission", "general"],
+    # Chanhassen price types that are listed
+    "chanhassen_price_type": ["concert only"],
+}
+
+_keyword_sets: Dict[str, list] = dict(DEFAULT_KEYWORD_SETS)
+_filters: Dict[str, "KeywordFilter"] = {}
+
+
+class KeywordFilter:
+    """
+    Case-insensitive "contains any keyword" test, compiled into one regex.
+
+    Verdicts are memoized per text, so names coming from small lookup tables
+    (sections, categories, special seating, price codes) are scanned once.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({kw.lower() for kw in keywords if kw}, key=len, reverse=True)
+        self._pattern = re.compile("|".join(map(re.escape, self.keywords))) if self.keywords else None
+        self._verdicts: Dict[str, bool] = {}
+
+    def matches(self, text) -> bool:
+        """True if ``text`` contains any of the keywords."""
+        verdict = self._verdicts.get(text)
+        if verdict is None:
+            verdict = self._pattern is not None and self._pattern.search(str(text or "").lower()) is not None
+            self._verdicts[text] = verdict
+        return verdict
+
+    def matching_ids(self, names: Dict) -> Set:
+        """Keys of an {id: name} lookup table whose name matches."""
+        return {key for key, name in names.items() if self.matches(name)}
+
+
+def configure(config: Optional[dict]) -> None:
+    """
+    Load keyword lists from the config's SEAT_FILTER_KEYWORDS entry (a dict or
+    JSON string of {filter name: [keywords]}); missing names keep their defaults.
+    """
+    overrides = (config or {}).get(CONFIG_KEY) or {}
+    if isinstance(overrides, str):
+        try:
+            overrides = json.loads(overrides)
+        except json.JSONDecodeError as e:
+            logger.error("Invalid %s in config, using default keyword lists: %s", CONFIG_KEY, e)
+            overrides = {}
+
+    _keyword_sets.clear()
+    _keyword_sets.update(DEFAULT_KEYWORD_SETS)
+    _keyword_sets.update({name: list(keywords) for name, keywords in overrides.items()})
+    _filters.clear()
+
+
+def keyword_filter(name: str) -> KeywordFilter:
+    """Return the compiled filter for a named keyword set, built once per container."""
+    compiled = _filters.get(name)
+    if compiled is None:
+        compiled = _filters[name] = KeywordFilter(_keyword_sets[name])
+    return compiled
@@ -1,5 +1,5 @@
 import pandas as pd
-import re, time, json, logging
+import re, time, logging
 from datetime import datetime
 from dateutil import parser
 import requests
@@ -7,6 +7,8 @@ from bs4 import BeautifulSoup
 import csv
 import os
 import html
+from seat_batch import SeatBatch, dumps_result
+from seat_filter import keyword_filter
 
 # Configure logging
 logging.basicConfig(
@@ -148,6 +150,10 @@ def get_seats(event, venue, max_retries):
             if venue_element:
                 sub_venue = venue_element.text.split("\u2013")[0].split("-")[0].strip()
 
+            seats_data = SeatBatch(venue, event.get("event_name", ""), event.get("event_date", ""),
+                                   event.get("event_time", ""), f"{performance_id}|{event.get('event_url','')}",
+                                   timestamp=get_current_timestamp(), extra={"Sub Venue": sub_venue})
+
             script_tag = soup.find("script", string=re.compile("var currentSeats"))
             if script_tag:
                 script_text = script_tag.string
@@ -157,35 +163,26 @@ def get_seats(event, venue, max_retries):
                 price_type_dict = {seat_id: desc for seat_id, desc in price_types_pattern if desc.lower() != 'undefined'}
                 for price_type_id, price_id, price_value in price_pattern:
                     price_value = float(price_value.replace("$", ""))
-                    if any(kw in price_type_dict.get(price_type_id, "").lower().strip() for kw in ['concert only']):
+                    if keyword_filter("chanhassen_price_type").matches(price_type_dict.get(price_type_id, "")):
                         price_info[price_id] = min(price_info.get(price_id, float("inf")), price_value)
 
             if not price_info:
                 raise Exception("Price data not found.")
 
+            accessible = keyword_filter("accessible_seat")
             for group in soup.select('.seatGroup > g'):
                 seat_price_id = group.get('id', "")
                 for circle in group.find_all('circle', {'data-status': 'A'}):
                     seat_desc = circle.get('data-tsmessage', '').strip()
-                    if any(kw in seat_desc.lower() for kw in ['accessible', 'wheelchair', 'companion', 'obstructed']):
+                    if accessible.matches(seat_desc):
                         continue
                     price = price_info.get(seat_price_id, 0)
                     if price == 0:
                         continue
-                    seats_data.append({
-                        'Venue Name': venue,
-                        'Event Name': event.get("event_name", ""),
-                        'Event Date': event.get("event_date", ""),
-                        'Event Time': event.get("event_time", ""),
-                        'Section': circle.get('data-seat-section', '').strip(),
-                        'Row': circle.get('data-seat-row', '').strip(),
-                        'Seat': circle.get('data-seat-seat', '').strip(),
-                        'Price': price,
-                        'Desc': seat_desc,
-                        'UniqueIdentifier': f"{performance_id}|{event.get('event_url','')}",
-                        'TimeStamp': get_current_timestamp(),
-                        'Sub Venue': sub_venue
-                    })
+                    seats_data.add(circle.get('data-seat-section', '').strip(),
+                                   circle.get('data-seat-row', '').strip(),
+                                   circle.get('data-seat-seat', '').strip(),
+                                   price, seat_desc)
         else:
             raise Exception("No response from seats API.")
 
@@ -255,7 +252,7 @@ def scrape_event(venue_name, event_unique_id, max_retry=3):
                 success_msg = f"Scraping completed successfully in {elapsed_time} minutes"
                 logger.info(f"[SUCCESS] {success_msg}")
 
-                return json.dumps({
+                return dumps_result({
                     "status": "success",
                     "event_data": seats_data,
                     "message": success_msg
@@ -268,7 +265,7 @@ def scrape_event(venue_name, event_unique_id, max_retry=3):
         error_msg = f"An error occurred: {str(e)} | Time taken: {elapsed_time} minutes"
         logger.error(f"[ERROR] {error_msg}")
 
-        return json.dumps({
+        return dumps_result({
             "status": "error",
             "event_data": seats_data,
             "message": error_msg
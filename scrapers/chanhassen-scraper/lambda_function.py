@@ -2,13 +2,15 @@ import json
 import os
 import ast
 import logging
-from datetime import datetime
 import pandas as pd
-from sqlalchemy import create_engine, MetaData, update
+import seat_filter
 from read_config import read_config
 from orchestrator_api import add_item_to_queue_with_bucket
 from chanhassen_scraper import scrape_event
 from error_logger import log_error_to_db
+from sink_pipeline import run_sinks
+from scraper_data_writer import write_scraper_data
+from db_engine import get_engine, mark_being_processed, reset_being_processed
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -20,51 +22,20 @@ DB_HOST     = config.get("DB_HOST")
 DB_PASSWORD = config.get("DB_PASSWORD")
 DB_USER     = config.get("DB_USER")
 bucket_name = config.get("BucketName", "")
+ENGINE_URL  = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+seat_filter.configure(config)
 
-def save_eventData_to_db(response_body: str) -> None:
-    payload = json.loads(response_body)
-    rows = payload.get("event_data", [])
-    logger.info("Persist raw event_data sample: %s", rows[:1])
+def save_eventData_to_db(records: list) -> None:
+    logger.info("Persist raw event_data sample: %s", records[:1])
 
-    df = pd.DataFrame(rows)
-    if df.empty:
-        logger.info("DataFrame is empty — no seats to persist.")
+    if not records:
+        logger.info("No seat records — no seats to persist.")
         return
 
-    if "event_date" in df.columns:
-        df["event_date"] = pd.to_datetime(df["event_date"], format="%Y-%m-%d", errors="coerce")
-
-    if "event_time" in df.columns:
-        def _norm(t):
-            try:
-                return datetime.strptime(t, "%H:%M:%S").strftime("%H:%M:%S")
-            except Exception:
-                return None
-        df["event_time"] = df["event_time"].astype(str).apply(_norm)
-
-    if "price" in df.columns:
-        df["price"] = pd.to_numeric(df["price"], errors="coerce")
-
-    if "row" in df.columns:
-        df["row"] = df["row"].astype(str).str.replace(r"^Row:\s*", "", regex=True).str.strip()
-
-    if "seat_no" in df.columns:
-        df["seat_no"] = pd.to_numeric(df["seat_no"], errors="coerce").fillna(0).astype(int)
-
-    # Add timestamp processing
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], format="%d %b %Y %H:%M:%S", errors="coerce")
-        df["timestamp"] = df["timestamp"].fillna(pd.Timestamp.now())
-
-    if "uniqueidentifier" in df.columns:
-        df = df.rename(columns={"uniqueidentifier": "unique_id"})
-
-    engine = create_engine(
-        f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    )
+    engine = get_engine(ENGINE_URL)
     try:
-        df.to_sql("scraper_data", engine, if_exists="append", index=False, chunksize=500)
-        logger.info("Persisted %s rows to scraper_data", len(df))
+        saved = write_scraper_data(engine, records)
+        logger.info("Persisted %s rows to scraper_data", saved)
     except Exception as e:
         logger.exception("Failed to write to MySQL: %s", e)
 
@@ -75,8 +46,8 @@ def save_eventData_to_db(response_body: str) -> None:
         event_date = None
         event_time = None
 
-        if not df.empty:
-            first_row = df.iloc[0].to_dict()
+        if records:
+            first_row = records[0]
             venue_name = first_row.get("venue_name")
             event_name = first_row.get("event_name") 
             event_id = first_row.get("event_id")
@@ -92,6 +63,7 @@ def save_eventData_to_db(response_body: str) -> None:
            event_time=event_time,
            error_details=str(e), 
            process_name="save_eventData_to_db")
+        raise
 
 def lambda_handler(event, context):
     logger.info("lambda_handler invoked with event = %s", event)
@@ -117,8 +89,7 @@ def lambda_handler(event, context):
         evt_date, evt_time = body["event_datetime"].split(" ")
         event_url = body.get("event_url", "")
 
-        engine_url = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-        engine = create_engine(engine_url)
+        engine = get_engine(ENGINE_URL)
 
         # Try scraping the event data and handling real scrape exceptions
         try:
@@ -231,34 +202,30 @@ def lambda_handler(event, context):
 
         # ─── Queue push & DB update (events_to_process) ────────────────────
         if process in ("lister", "checker"):
-            metadata = MetaData()
-            metadata.reflect(bind=engine)
-            table = metadata.tables["events_to_process"]
-        
             # Step 1: Mark as being processed
-            stmt = update(table).where(table.c.event_id == event_num).values(is_being_processed=1)
-            with engine.begin() as conn:
-                conn.execute(stmt)
-        
-            try:
-                # Step 2: Try enqueuing
-                add_item_to_queue_with_bucket(payload, process, bucket_name)
+            mark_being_processed(engine, event_num)
+
+        # Enqueue and save seat data concurrently; each sink reports its own outcome
+        records = payload["event_data"]
+        sinks = {"scraper_data": lambda: save_eventData_to_db(records)}
+        if process in ("lister", "checker"):
+            sinks["orchestrator"] = lambda: add_item_to_queue_with_bucket(payload, process, bucket_name)
+        outcomes = run_sinks(sinks)
+
+        if process in ("lister", "checker"):
+            if outcomes["orchestrator"]["ok"]:
                 logger.info("Enqueued into %s queue", process)
-        
-            except Exception as e:
+            else:
+                e = outcomes["orchestrator"]["error"]
                 logger.error("Queue or DB update failed: %s", e)
-        
+
                 # Step 3: Reset is_being_processed to 0 on failure
-                rollback_stmt = update(table).where(table.c.event_id == event_num).values(is_being_processed=0)
-                with engine.begin() as conn:
-                    conn.execute(rollback_stmt)
-        
+                reset_being_processed(engine, event_num)
+
                 log_error_to_db(engine, venue_name=venue_name, venue_id=str(venue_id), event_name=evt_name,
                                 event_id=str(event_num), event_date=evt_date, event_time=evt_time,
                                 error_details=str(e), process_name=process)
 
-        save_eventData_to_db(json.dumps({ "event_data": df.to_dict(orient="records") }))
-
         return {
             "statusCode": 200,
             "body": payload,
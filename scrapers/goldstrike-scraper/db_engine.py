@@ -0,0 +1,76 @@
+import logging
+import os
+
+from sqlalchemy import MetaData, Table, create_engine, update
+
+logger = logging.getLogger(__name__)
+
+# Recycle pooled connections before MySQL / RDS drops them as idle
+DB_POOL_RECYCLE_SECONDS = int(os.environ.get("DB_POOL_RECYCLE_SECONDS", 280))
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 2))
+
+EVENTS_TABLE = "events_to_process"
+
+_engines = {}
+_events_tables = {}
+
+
+def get_engine(engine_url: str):
+    """
+    Return the pooled SQLAlchemy engine for ``engine_url``, creating it on first use.
+
+    The engine lives at module level, so warm Lambda invocations reuse its
+    open MySQL connections instead of opening new ones per scrape. Scraper
+    persistence and error logging share it. ``pool_pre_ping`` replaces
+    connections that went stale while the container was frozen.
+    """
+    engine = _engines.get(engine_url)
+    if engine is None:
+        engine = create_engine(
+            engine_url,
+            pool_pre_ping=True,
+            pool_recycle=DB_POOL_RECYCLE_SECONDS,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_POOL_SIZE,
+        )
+        _engines[engine_url] = engine
+        logger.info("Created pooled DB engine (pool_size=%s, recycle=%ss)", DB_POOL_SIZE, DB_POOL_RECYCLE_SECONDS)
+    return engine
+
+
+def get_events_table(engine) -> Table:
+    """
+    Return the events_to_process table, reflected once per engine.
+
+    Only that one table is reflected, and the handle is cached with the
+    engine, so warm invocations skip schema reflection entirely.
+    """
+    table = _events_tables.get(engine)
+    if table is None:
+        metadata = MetaData()
+        metadata.reflect(bind=engine, only=[EVENTS_TABLE])
+        table = metadata.tables[EVENTS_TABLE]
+        _events_tables[engine] = table
+    return table
+
+
+def _update_event(engine, event_id, **values) -> None:
+    table = get_events_table(engine)
+    with engine.begin() as conn:
+        conn.execute(update(table).where(table.c.event_id == event_id).values(**values))
+
+
+def mark_being_processed(engine, event_id) -> None:
+    """Set is_being_processed = 1 for ``event_id``."""
+    _update_event(engine, event_id, is_being_processed=1)
+
+
+def reset_being_processed(engine, event_id) -> None:
+    """Set is_being_processed back to 0 for ``event_id`` so it can be retried."""
+    _update_event(engine, event_id, is_being_processed=0)
+
+
+def increment_error_count(engine, event_id) -> None:
+    """Add one to error_count for ``event_id``."""
+    table = get_events_table(engine)
+    _update_event(engine, event_id, error_count=table.c.error_count + 1)
@@ -5,6 +5,8 @@ import time
 import json
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from seat_batch import DB_KEYS, SeatBatch, dumps_result
+from seat_filter import keyword_filter
 
 API_ENDPOINT_PREFIX = ""
 MAX_RETRIES = 3
@@ -381,7 +383,8 @@ def calculate_facility_fee(price):
 def get_seats(event, venue):
     """Optimized seat extraction with better error handling"""
     print(f"Getting seats for event: {event.get('event_name')}")
-    all_seats = []
+    all_seats = SeatBatch(venue, event.get("event_name"), event.get("event_date"), event.get("event_time"),
+                          event.get("performance_id", ""), keys=DB_KEYS)
 
     try:
         # Get seatmap configuration
@@ -395,15 +398,19 @@ def get_seats(event, venue):
         categories = {c.get("id"): c.get("name", "") for c in seatmap.get("categories", [])}
         specials = {s.get("id"): s.get("name", "") for s in seatmap.get("specialSeating", [])}
 
+        # Keyword verdicts are resolved once per lookup-table ID, not per seat
+        restricted = keyword_filter("restricted_seating")
+        premium = keyword_filter("premium_price")
+        blocked_sections = restricted.matching_ids(sections)
+        blocked_specials = restricted.matching_ids(specials)
+
         # Build pricing map
         pricing = {}
         for p in seatmap.get("prices", []):
-            name = p.get("priceCodeName", "").lower()
-            if any(kw in name for kw in ['vip', 'premium']):
+            if premium.matches(p.get("priceCodeName", "")):
                 continue
             cat = p.get("seatCategory")
-            cat_name = categories.get(cat, "").lower()
-            if any(kw in cat_name for kw in ["wheelchair", "companion", "obstructed", "accessible", "standing room only", "ada seating", "vip", "obstructed view", "partially obstructed view"]):
+            if restricted.matches(categories.get(cat, "")):
                 continue
             pricing[cat] = max(p.get("price", 0), pricing.get(cat, 0))
 
@@ -431,15 +438,13 @@ def get_seats(event, venue):
                     continue
 
                 section_id = int(info[3]) if info[3].isdigit() else 0
-                section_name = sections.get(section_id, "").lower().strip()
-                if any(kw in section_name for kw in ["wheelchair", "companion", "obstructed", "accessible", "standing room only", "ada seating", "vip", "obstructed view", "partially obstructed view"]):
+                if section_id in blocked_sections:
                     continue
+                section_name = sections.get(section_id, "").lower().strip()
 
                 special_id = info[8]
-                if special_id.isdigit():
-                    special_name = specials.get(int(special_id), "").lower()
-                    if any(kw in special_name for kw in ["wheelchair", "companion", "obstructed", "accessible", "standing room only", "ada seating", "vip", "obstructed view", "partially obstructed view"]):
-                        continue
+                if special_id.isdigit() and int(special_id) in blocked_specials:
+                    continue
 
                 section = SECTION_MAP_DICT.get(section_name, section_name.title())
                 row, seat = info[5], info[6]
@@ -452,19 +457,7 @@ def get_seats(event, venue):
                 fee = calculate_facility_fee(price)
                 total = round(price + tax + fee, 2)
 
-                all_seats.append({
-                    "venue_name": venue,
-                    "event_name": event.get("event_name"),
-                    "event_date": event.get("event_date"),
-                    "event_time": event.get("event_time"),
-                    "section": section,
-                    "row": row,
-                    "seat_no": seat,
-                    "price": total,
-                    "description": "",
-                    "unique_id": event.get("performance_id", ""),
-                    "timestamp": time.strftime("%d %b %Y %H:%M:%S", time.localtime())
-                })
+                all_seats.add(section, row, seat, total)
 
             except Exception as e:
                 print(f"Error processing seat {sid}: {e}")
@@ -527,7 +520,7 @@ def scrape_event( venue_name, event_unique_id, start_date, end_date, max_retries
 
         print(f"Successfully extracted {len(seats_data)} seats in {duration} minutes")
 
-        return json.dumps({
+        return dumps_result({
             "status": "success",
             "message": f"Successfully extracted {len(seats_data)} seats",
             "event_data": seats_data
@@ -0,0 +1,162 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Memory budgeted per Chrome process and kept back for the Python process
+SESSION_MEMORY_MB = int(os.getenv("BROWSER_SESSION_MEMORY_MB", "512"))
+RESERVED_MEMORY_MB = int(os.getenv("BROWSER_RESERVED_MEMORY_MB", "512"))
+# Hard cap on concurrent browsers; BROWSER_POOL_SIZE overrides the memory-based size
+MAX_POOL_SIZE = int(os.getenv("BROWSER_POOL_MAX_SIZE", "4"))
+# Browsers are restarted after this many sessions to bound Chrome's memory growth
+MAX_USES_PER_BROWSER = int(os.getenv("BROWSER_MAX_USES", "50"))
+
+_CGROUP_LIMIT_FILES = ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes")
+
+
+def container_memory_mb() -> Optional[int]:
+    """Memory limit of the container (cgroup v2 / v1), else of the host; None if unknown."""
+    for path in _CGROUP_LIMIT_FILES:
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 50:
+            return int(value) // (1024 * 1024)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_pool_size() -> int:
+    """Concurrent browsers the container can hold, between 1 and MAX_POOL_SIZE."""
+    configured = os.getenv("BROWSER_POOL_SIZE")
+    if configured:
+        return max(1, int(configured))
+    memory_mb = container_memory_mb()
+    if memory_mb is None:
+        return 1
+    return max(1, min(MAX_POOL_SIZE, (memory_mb - RESERVED_MEMORY_MB) // SESSION_MEMORY_MB))
+
+
+class _Browser:
+    __slots__ = ("driver", "profile_dir", "base_handle", "uses")
+
+    def __init__(self, driver, profile_dir: str):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.base_handle = driver.current_window_handle
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    Warm Chrome processes shared by every scrape in the container.
+
+    A browser is started on first demand and kept for later sessions, so the
+    driver cold start is paid once per container instead of once per
+    performance. Each session gets a new tab and starts without cookies; a
+    browser that stops responding is quit and replaced. At most ``size``
+    sessions run at once, further callers wait for a free browser.
+
+    Args:
+        driver_factory: Callable taking a Chrome user-data-dir and returning a started WebDriver
+        size: Maximum number of browsers; defaults to what the container memory allows
+    """
+
+    def __init__(self, driver_factory: Callable, size: Optional[int] = None):
+        self.driver_factory = driver_factory
+        self.size = size or default_pool_size()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle: List[_Browser] = []
+        self._closed = False
+
+    def _start(self) -> _Browser:
+        profile_dir = tempfile.mkdtemp(prefix="chrome-user-data-")
+        try:
+            browser = _Browser(self.driver_factory(profile_dir), profile_dir)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        logger.info("Started pooled browser (%d max)", self.size)
+        return browser
+
+    @staticmethod
+    def _retire(browser: _Browser) -> None:
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning("Error quitting pooled browser: %s", e)
+        shutil.rmtree(browser.profile_dir, ignore_errors=True)
+
+    @staticmethod
+    def _alive(browser: _Browser) -> bool:
+        try:
+            return browser.base_handle in browser.driver.window_handles
+        except Exception:
+            return False
+
+    def _checkout(self) -> _Browser:
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                browser = self._idle.pop() if self._idle else None
+            if browser is None:
+                return self._start()
+            if self._alive(browser):
+                return browser
+            logger.warning("Pooled browser is not responding, replacing it")
+            self._retire(browser)
+
+    def _reset(self, browser: _Browser) -> bool:
+        """Close the session's tabs and drop its cookies; False if the browser is unusable."""
+        driver = browser.driver
+        try:
+            for handle in driver.window_handles:
+                if handle != browser.base_handle:
+                    driver.switch_to.window(handle)
+                    driver.close()
+            driver.switch_to.window(browser.base_handle)
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            return True
+        except Exception as e:
+            logger.warning("Could not reset pooled browser, replacing it: %s", e)
+            return False
+
+    @contextmanager
+    def session(self):
+        """Yield a WebDriver focused on a fresh tab of a pooled browser."""
+        self._slots.acquire()
+        browser = None
+        try:
+            browser = self._checkout()
+            browser.uses += 1
+            browser.driver.switch_to.new_window("tab")
+            yield browser.driver
+        finally:
+            if browser is not None:
+                keep = (self._reset(browser) and browser.uses < MAX_USES_PER_BROWSER)
+                with self._lock:
+                    if keep and not self._closed:
+                        self._idle.append(browser)
+                        browser = None
+                if browser is not None:
+                    self._retire(browser)
+            self._slots.release()
+
+    def close(self) -> None:
+        """Quit every idle browser; sessions still running are quit when they end."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            self._retire(browser)
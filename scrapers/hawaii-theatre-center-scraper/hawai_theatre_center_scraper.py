@@ -13,6 +13,9 @@ from datetime import datetime
 
 # Custom module to read configuration settings
 from read_config import read_config
+from seat_batch import SeatBatch, dumps_result
+from seat_filter import keyword_filter
+from browser_pool import BrowserPool
 
 # Load configuration settings from external config file
 config = read_config()
@@ -120,6 +123,28 @@ def get_auth_tokens(url, venue):
 
     return data
 
+_chromedriver_path = None
+
+
+def start_chrome(profile_dir):
+    """Start the Chrome used for GA checkout pages; chromedriver is resolved once per container."""
+    global _chromedriver_path
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    if _chromedriver_path is None:
+        _chromedriver_path = ChromeDriverManager().install()
+
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument('--ignore-certificate-errors')
+    chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    return webdriver.Chrome(service=Service(_chromedriver_path), options=chrome_options)
+
+
+# Browsers are started on first use and reused by later GA scrapes in the container
+browser_pool = BrowserPool(start_chrome)
+
 def check_alert(driver):
     try:
         # Locate and wait the alert div
@@ -249,74 +274,29 @@ def get_ga_seats(event, venue):
     per_ticket_price = 0
     # ARIA_LABEL = ARIA_LABEL.split(",")
 
-    # Set up Chrome options
-    chrome_options = webdriver.ChromeOptions()
-    chrome_options.add_argument('--ignore-certificate-errors')
-
-    driver = None
     try:
-        # Attempt to initialize the Chrome driver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-
-        driver.get(event["event_url"])
-
-        try:
-            add_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//button[" 
-                    "starts-with(translate(normalize-space(@aria-label), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'add') "
-                    "and contains(translate(@aria-label, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'tickets') "
-                    "and contains(@class, 'btn-primary')]"
-                ))
-            )
-            print("Found 'Add Standard tickets' button, clicking it...")
-            add_button.click()
-            print("Clicked 'Add Standard tickets' button.")
-            time.sleep(2)
-        except:
-            print("No 'Add Standard tickets' button found, continuing...")
-
-        # Wait for the event page to load and the quantity input field to appear
-        input_field = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((
-                By.XPATH,
-                " | ".join([
-                    f"//input[substring(@aria-label, string-length(@aria-label) - string-length('Quantity') + 1) = 'Quantity']"
-                ])
-            ))
-        )
-        print("Input field for quantity found.")
-        input_field.clear()  # Clears any existing value
-        print("Cleared input field.")
-        input_field.send_keys(str(no_of_tickets))  # Enter the number of tickets
-        print(f"Entered {no_of_tickets} tickets in the input field.")
+        # Pooled browser: started once per container, fresh tab per event
+        with browser_pool.session() as driver:
+            driver.get(event["event_url"])
 
-        try:
-            add_to_cart_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//button[starts-with(normalize-space(text()), 'Add') "
-                    "and substring(normalize-space(text()), string-length(normalize-space(text())) - string-length('Cart') + 1) = 'Cart' "
-                    "and contains(@class, 'btn-primary')]"
-                ))
-            )
-            print("Found 'Add Cart' button, clicking it...")
-            add_to_cart_button.click()
-            print("Clicked 'Add to Cart' button successfully.")
-            time.sleep(2)
-        except:
-            print("No matching 'Add Cart' button found")
-        
-        # Check for any alerts after attempting to add to cart
-        max_allowedQnt=check_alert(driver)
-        print("Maximum allowed quantity:", max_allowedQnt)
-        if max_allowedQnt:
-            no_of_tickets = max_allowedQnt
-            print(f"Maximum allowed quantity is {no_of_tickets}. Updating input field.")
-
-            # Clear the input field and enter the new quantity
+            try:
+                add_button = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable((
+                        By.XPATH,
+                        "//button[" 
+                        "starts-with(translate(normalize-space(@aria-label), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'add') "
+                        "and contains(translate(@aria-label, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'tickets') "
+                        "and contains(@class, 'btn-primary')]"
+                    ))
+                )
+                print("Found 'Add Standard tickets' button, clicking it...")
+                add_button.click()
+                print("Clicked 'Add Standard tickets' button.")
+                time.sleep(2)
+            except:
+                print("No 'Add Standard tickets' button found, continuing...")
+
+            # Wait for the event page to load and the quantity input field to appear
             input_field = WebDriverWait(driver, 5).until(
                 EC.presence_of_element_located((
                     By.XPATH,
@@ -325,62 +305,98 @@ def get_ga_seats(event, venue):
                     ])
                 ))
             )
+            print("Input field for quantity found.")
+            input_field.clear()  # Clears any existing value
+            print("Cleared input field.")
+            input_field.send_keys(str(no_of_tickets))  # Enter the number of tickets
+            print(f"Entered {no_of_tickets} tickets in the input field.")
+
+            try:
+                add_to_cart_button = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable((
+                        By.XPATH,
+                        "//button[starts-with(normalize-space(text()), 'Add') "
+                        "and substring(normalize-space(text()), string-length(normalize-space(text())) - string-length('Cart') + 1) = 'Cart' "
+                        "and contains(@class, 'btn-primary')]"
+                    ))
+                )
+                print("Found 'Add Cart' button, clicking it...")
+                add_to_cart_button.click()
+                print("Clicked 'Add to Cart' button successfully.")
+                time.sleep(2)
+            except:
+                print("No matching 'Add Cart' button found")
+        
+            # Check for any alerts after attempting to add to cart
+            max_allowedQnt=check_alert(driver)
+            print("Maximum allowed quantity:", max_allowedQnt)
+            if max_allowedQnt:
+                no_of_tickets = max_allowedQnt
+                print(f"Maximum allowed quantity is {no_of_tickets}. Updating input field.")
+
+                # Clear the input field and enter the new quantity
+                input_field = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((
+                        By.XPATH,
+                        " | ".join([
+                            f"//input[substring(@aria-label, string-length(@aria-label) - string-length('Quantity') + 1) = 'Quantity']"
+                        ])
+                    ))
+                )
             
-            input_field.clear()
-            input_field.send_keys(str(no_of_tickets))
-            add_to_cart_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//button[starts-with(normalize-space(text()), 'Add') "
-                    "and substring(normalize-space(text()), string-length(normalize-space(text())) - string-length('Cart') + 1) = 'Cart' "
-                    "and contains(@class, 'btn-primary')]"
-                ))
+                input_field.clear()
+                input_field.send_keys(str(no_of_tickets))
+                add_to_cart_button = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable((
+                        By.XPATH,
+                        "//button[starts-with(normalize-space(text()), 'Add') "
+                        "and substring(normalize-space(text()), string-length(normalize-space(text())) - string-length('Cart') + 1) = 'Cart' "
+                        "and contains(@class, 'btn-primary')]"
+                    ))
+                )
+                print("Found 'Add to Cart' button")
+                add_to_cart_button.click()
+                print("Clicked 'Add to Cart' button successfully.")
+                time.sleep(2)
+
+            # Wait for the item total to be visible
+            item_total_span = WebDriverWait(driver, 5).until(
+                EC.visibility_of_element_located((By.CSS_SELECTOR, ".text-right.col span.total"))
             )
-            print("Found 'Add to Cart' button")
-            add_to_cart_button.click()
-            print("Clicked 'Add to Cart' button successfully.")
-            time.sleep(2)
-
-        # Wait for the item total to be visible
-        item_total_span = WebDriverWait(driver, 5).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, ".text-right.col span.total"))
-        )
-        print("Item total span found.")
-        print(item_total_span.text.split("$"))
-        item_total = float(item_total_span.text.split("$")[1])
-        print(f"Item total extracted: ${item_total}")
-        per_ticket_price = str(item_total / no_of_tickets)
-        print(f"Per ticket price calculated: ${per_ticket_price}")
-
-        # Create the data for the tickets
-        current_time = time.strftime("%d %b %Y %H:%M:%S", time.localtime())
-        data = [{
-            'Venue Name': venue,
-            'Event Name': event["event_name"],
-            'Event Date': event["event_date"],
-            'Event Time': event["event_time"],
-            'Section': "General Admission",
-            'Row': "GA",
-            'Seat': "",
-            'Price': per_ticket_price,
-            'Desc': str(no_of_tickets)+"-max seats",
-            'UniqueIdentifier': event["event_url"],
-            'TimeStamp': current_time
-        }]
+            print("Item total span found.")
+            print(item_total_span.text.split("$"))
+            item_total = float(item_total_span.text.split("$")[1])
+            print(f"Item total extracted: ${item_total}")
+            per_ticket_price = str(item_total / no_of_tickets)
+            print(f"Per ticket price calculated: ${per_ticket_price}")
+
+            # Create the data for the tickets
+            current_time = time.strftime("%d %b %Y %H:%M:%S", time.localtime())
+            data = [{
+                'Venue Name': venue,
+                'Event Name': event["event_name"],
+                'Event Date': event["event_date"],
+                'Event Time': event["event_time"],
+                'Section': "General Admission",
+                'Row': "GA",
+                'Seat': "",
+                'Price': per_ticket_price,
+                'Desc': str(no_of_tickets)+"-max seats",
+                'UniqueIdentifier': event["event_url"],
+                'TimeStamp': current_time
+            }]
 
     except Exception as e:
         current_time = time.strftime("%d %b %Y %H:%M:%S", time.localtime())
         logger.exception(f"[{venue}] Error occurred while extracting GA seats for {event.get('event_name')} on {event.get('event_date')} {event.get('event_time')}: {e}")
         print("An error occurred while extracting GA seats:", e)
-    finally:
-        if driver:
-            driver.quit()
     return data
 
 def get_seats(event, tokens, venue):
     global DICT_SEATING
     eventUrl = event.get("event_url", "")
-    seats_data = []
+    seats_data = SeatBatch(venue, event.get("event_name", ""), event.get("event_date", ""),
+                           event.get("event_time", ""), eventUrl)
 
     # Convert string data into dictionary
     if not DICT_SEATING:
@@ -466,14 +482,11 @@ def get_seats(event, tokens, venue):
             for pg in price_groups
         }
 
+        accessible = keyword_filter("accessible_seat")
         for seat in seats:
             try:
-                if seat["avail"] and not any(
-                    kw in str(seat.get("note", "")).lower()
-                    for kw in ['companion', 'wheelchair', 'accessible', 'obstructed']
-                ):
-                    seat_name = seat.get("snName", "").lower().strip()
-                    if any(kw in seat_name for kw in ['companion', 'wheelchair', 'accessible', 'obstructed']):
+                if seat["avail"] and not accessible.matches(seat.get("note", "")):
+                    if accessible.matches(seat.get("snName", "")):
                         continue
 
                     seat_info_str = seat.get("key", "")
@@ -493,20 +506,7 @@ def get_seats(event, tokens, venue):
                     seat_no = ''.join([char for char in seat_info_str.split(":")[2] if char.isdigit()]) if ":" in seat_info_str else ""
                     desc = seat.get("note", "")
 
-                    seats_data.append({
-                        "Venue Name": venue,
-                        "Event Name": event.get("event_name", ""),
-                        "Event Date": event.get("event_date", ""),
-                        "Event Time": event.get("event_time", ""),
-                        "Section": section_name,
-                        "Row": row,
-                        "Seat": seat_no,
-                        "Price": price,
-                        "Desc": desc,
-                        "UniqueIdentifier": event.get("event_url", ""),
-                        "TimeStamp": time.strftime("%d %b %Y %H:%M:%S", time.localtime()),
-                        # "Sub Venue": subvenue
-                    })
+                    seats_data.add(section_name, row, seat_no, price, desc)
             except Exception as e:
                 logger.warning(f"[{venue}] Exception while adding seat: {e}")
 
@@ -558,7 +558,7 @@ def scrape_event(event_url, venue_name):
             total_event_time = round((event_end_time - event_start_time) / 60, 2)
             logger.info(f"[{venue_name}] {success_message}. Took {total_event_time} minutes.")
 
-            return json.dumps({
+            return dumps_result({
                 "status": "success",
                 "event_data": seats_data,
                 "message": success_message
@@ -570,7 +570,7 @@ def scrape_event(event_url, venue_name):
         error_msg = f"Exception occurred while scraping event {event_url}: {str(e)}. Took {total_event_time} minutes."
         logger.error(f"[{venue_name}] {error_msg}")
 
-        return json.dumps({
+        return dumps_result({
             "status": "error",
             "event_data": seats_data,
             "message": error_msg
@@ -4,6 +4,8 @@ import json
 import requests
 from datetime import datetime
 from dateutil import parser
+from seat_batch import SeatBatch, dumps_result
+from seat_filter import keyword_filter
 
 # =====================
 # Configuration Values
@@ -179,7 +181,8 @@ def get_non_available_seats(event):
 
 def get_seats(event, venue):
     """Extract available seats for a given event."""
-    all_seats = []
+    all_seats = SeatBatch(venue, event.get("event_name"), event.get("event_date"), event.get("event_time"),
+                          event.get("performance_id"), timestamp=get_current_timestamp())
     try:
         seatmap = get_performance_seatmap(event)
         if not seatmap:
@@ -192,13 +195,18 @@ def get_seats(event, venue):
         special_dict = {s["id"]: s["name"] for s in seatmap.get("specialSeating", [])}
         pricing_dict = {}
 
+        # Keyword verdicts are resolved once per lookup-table ID, not per seat
+        restricted = keyword_filter("restricted_seating")
+        premium = keyword_filter("premium_price")
+        blocked_sections = restricted.matching_ids(sections_dict)
+        blocked_specials = restricted.matching_ids(special_dict)
+
         # Filter valid prices
         for price in seatmap.get("prices", []):
-            if any(kw in price.get("priceCodeName", "").lower() for kw in ['vip', 'premium']):
+            if premium.matches(price.get("priceCodeName", "")):
                 continue
             cat = price.get("seatCategory")
-            name = categories_dict.get(cat, "").lower()
-            if any(kw in name for kw in ["wheelchair", "companion", "obstructed", "accessible", "standing room only","ada seating","vip","obstructed view","partially obstructed view"]):
+            if restricted.matches(categories_dict.get(cat, "")):
                 continue
             pricing_dict[cat] = max(price.get("price", 0), pricing_dict.get(cat, 0))
 
@@ -214,15 +222,13 @@ def get_seats(event, venue):
                     continue
 
                 section_id = int(parts[3]) if parts[3].isdigit() else 0
-                section_name = sections_dict.get(section_id, "").lower()
-                if any(kw in section_name for kw in ["wheelchair", "companion", "obstructed", "accessible", "standing room only","ada seating","vip","obstructed view","partially obstructed view"]):
+                if section_id in blocked_sections:
                     continue
+                section_name = sections_dict.get(section_id, "").lower()
 
                 special_id = parts[8]
-                if special_id and special_id.isdigit():
-                    special_name = special_dict.get(int(special_id), "").lower()
-                    if any(kw in special_name for kw in ["wheelchair", "companion", "obstructed", "accessible", "standing room only","ada seating","vip","obstructed view","partially obstructed view"]):
-                        continue
+                if special_id and special_id.isdigit() and int(special_id) in blocked_specials:
+                    continue
 
                 category_id = int(parts[4]) if parts[4].isdigit() else 0
                 price = pricing_dict.get(category_id, 0)
@@ -234,19 +240,7 @@ def get_seats(event, venue):
                 if not (section_final and row and seat):
                     continue
 
-                all_seats.append({
-                    "Venue Name": venue,
-                    "Event Name": event["event_name"],
-                    "Event Date": event["event_date"],
-                    "Event Time": event["event_time"],
-                    "Section": section_final,
-                    "Row": row,
-                    "Seat": seat,
-                    "Price": round(price, 2),
-                    "Desc": "",
-                    "UniqueIdentifier": event.get("performance_id"),
-                    "TimeStamp": get_current_timestamp()
-                })
+                all_seats.add(section_final, row, seat, round(price, 2))
             except Exception as e:
                 print(f"Error parsing seat: {e}")
                 continue
@@ -284,7 +278,7 @@ def scrape_event( venue_name, event_id, start_date, end_date, max_retries):
         if not seats:
             raise Exception("No seats found")
 
-        return json.dumps({
+        return dumps_result({
             "status": "success",
             "message": f"Successfully extracted {len(seats)} seats",
             "event_data": seats
@@ -5,10 +5,12 @@ import json
 import re
 import html
 from curl_cffi import requests
-import pandas as pd
 import logging
 from datetime import datetime, timedelta
 import bs4
+from concurrent.futures import ThreadPoolExecutor
+from rate_limiter import HostRateLimiter
+from seatmap_registry import seatmap_registry
 
 
 # Setup logging
@@ -29,6 +31,12 @@ proxies = {
 
 logger.info(f"Proxy auth: {proxy_auth}")
 
+# Seatmaps of one performance are fetched concurrently; all threads share one
+# rate limiter, which pauses the host for everyone when it answers 429
+SEATMAP_MAX_WORKERS = int(os.environ.get("KENNEDY_SEATMAP_WORKERS", 4))
+SEATMAP_REQUESTS_PER_SECOND = float(os.environ.get("KENNEDY_SEATMAP_REQUESTS_PER_SECOND", 4))
+seatmap_rate_limiter = HostRateLimiter(SEATMAP_REQUESTS_PER_SECOND)
+
 def get_seatmap_ids(url, event_id):
     seatmap_ids = []
 
@@ -97,6 +105,7 @@ def get_event_seatmap(url, seatmap_id, event_id, event_name):
     logging.info(f"Request payload: {json_data}")
 
     try:
+        seatmap_rate_limiter.wait(url)
         response = requests.post(url, headers=headers, json=json_data, impersonate="chrome120", proxies=proxies, timeout=60,
                                  verify=False)
         logging.info(f"Response status: {response.status_code}")
@@ -184,17 +193,17 @@ def extract_event_data(url, seatmap_id, event_id, event_name, venue_details, max
 
             if status_code == 200:
                 response_data = response[1]
-                extracted_seats = get_event_tickets(response_data, venue_details)
-                df = pd.DataFrame(extracted_seats)
+                extracted_seats = get_event_tickets(response_data, venue_details) or []
                 if retries>0:
                     logging.info(f"Seatmap data fetched after {retries} retries.")
-                return df  # Exit the retry loop upon success
+                return extracted_seats  # Exit the retry loop upon success
             elif status_code == 429:
                 delay = random.randint(5, 8)
                 logging.warning(
                     f"Received 429 Too Many Requests. Retrying after {delay} seconds..."
                 )
-                time.sleep(delay)
+                # Pauses the other seatmap threads too; the retry waits in get_event_seatmap
+                seatmap_rate_limiter.back_off(url, delay)
                 retries += 1
 
             elif status_code == 500:
@@ -217,22 +226,13 @@ def extract_event_data(url, seatmap_id, event_id, event_name, venue_details, max
         logging.error(
             f"Failed to retrieve seatmap after {max_retries} retries"
         )
-        return pd.DataFrame()  # Return empty DataFrame instead of None
+        return []
 
 def get_seatmap_ids_from_event_id(seatmap_id_url, event_id, venue_name,event_name="", max_retries=4):
     retries = 0
-    if venue_name == "Kennedy Center Theater Lab":
-        return ["8e3990a2-f3ac-475f-9f75-adcc96ef2c23"]
-    elif venue_name == "Kennedy Center Eisenhower Theater":
-        return ["88c037f8-85d7-4b6f-ba75-c60daa4d152d","b9ae6b48-4f04-4126-a696-dbb51b040282","def92836-2a9e-4511-a465-eabef562a0c7"]
-    elif venue_name == "Kennedy Center Terrace Theater":
-        return ["66b5111e-2ec6-4a79-8144-6a6f44ad43a5"]
-    elif venue_name == "Kennedy Center Family Theater":
-        return ["76edbf0c-0afb-4626-80c9-987d5b7e8ae4"]
-    elif venue_name == "Kennedy Center Concert Hall":
-        return ["beb3f28f-285f-4048-bcdb-8b7eff417e45","6e31f4d0-134d-429d-ac3d-a08717148f68","13caa55d-19b8-450c-a5b5-af0a939c099e","08a3040b-f95e-4252-9fc6-a54277e7a20a"]
-    elif venue_name == "Kennedy Center Opera House":
-        return ["768cf3c3-8d4a-499f-ab4b-b5a79d1fb552","be589d78-31de-4744-af6b-ce116f4c86e1","514c8046-0615-4811-8658-6bc967970a7f","3ad65181-a52f-47f6-b6ef-a27c71d1b00d"]
+    seatmap_ids = seatmap_registry.lookup(venue_name, event_name)
+    if seatmap_ids:
+        return seatmap_ids
     while retries <= max_retries:
         try:
             sm_response = get_seatmap_ids(seatmap_id_url, event_id)
@@ -241,6 +241,8 @@ def get_seatmap_ids_from_event_id(seatmap_id_url, event_id, venue_name,event_nam
                 seatmap_ids = sm_response[1]
                 if seatmap_ids is None:
                     seatmap_ids = [""]
+                else:
+                    seatmap_registry.remember(venue_name, event_name, seatmap_ids)
                 if retries > 0:
                     logging.info(f"Seatmaps retrieved after {retries} retries")
                 break
@@ -336,18 +338,18 @@ def check_event(seatmap_url, seatmap_id_url, event_identifier, max_retries=3):
         seatmap_ids = get_seatmap_ids_from_event_id(seatmap_id_url, event_id, venue_name, event_name, max_retries)
         logger.info(f"Fetched seatmap_ids: {seatmap_ids}")
 
-        event_df_list = []
-        for seatmap_id in seatmap_ids:
+        def extract_seatmap(seatmap_id):
             logger.info(f"Extracting event data for seatmap_id={seatmap_id}")
-            event_df = extract_event_data(seatmap_url, seatmap_id, event_id, event_name, venue_details, max_retries=3)
-            if event_df is not None and not event_df.empty:
-                event_df_list.append(event_df)
+            return extract_event_data(seatmap_url, seatmap_id, event_id, event_name, venue_details, max_retries=3)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(SEATMAP_MAX_WORKERS, len(seatmap_ids)))) as pool:
+            seatmap_records = list(pool.map(extract_seatmap, seatmap_ids))
 
-        if not event_df_list:
+        event_data = [record for records in seatmap_records for record in records]
+        if not event_data:
             raise Exception("No event data extracted")
 
-        final_df = pd.concat(event_df_list, ignore_index=True)
-        return json.dumps({"status": success_string, "event_data": final_df.to_dict(orient="records"), "message": ""})
+        return json.dumps({"status": success_string, "event_data": event_data, "message": ""})
 
     except Exception as e:
         logger.error(f"Error processing event {event_identifier}: {e}")
@@ -3,12 +3,14 @@ import os
 import pandas as pd
 from kennedy_center_scraper import check_event
 from read_config import read_config
-from sqlalchemy import create_engine, Table, MetaData, update
 from datetime import datetime, timedelta
 import logging
 from orchestrator_api import add_item_to_queue_with_bucket
 import boto3
 from skybox_api import get_inventory
+from sink_pipeline import run_sinks
+from scraper_data_writer import write_scraper_data
+from db_engine import get_engine, mark_being_processed
 
 def log_error_to_db(engine, venue_name=None, venue_id=None, event_name=None, 
                    event_id=None, event_date=None, event_time=None, 
@@ -52,7 +54,7 @@ def lambda_handler(event, context):
 
         # Create engine early for error logging
         engine_url = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
-        engine = create_engine(engine_url)
+        engine = get_engine(engine_url)
 
         event_api_url = config.get('Kennedy_Center_EventAPI_URL')
         seatmap_id_url = config.get('Kennedy_Center_SeatMapId_URL')
@@ -139,32 +141,28 @@ def lambda_handler(event, context):
         logging.info(f"output bucket: {output}")
 
         if process_name == "lister" or process_name == "checker":
-            # send api call to orchestrator to trigger lister process
-            add_item_to_queue_with_bucket(output, process_name, bucket_name)
-
-            # Only insert to database if we have data
-            if df is not None and not df.empty:
-                # Insert the DataFrame into the DB table 
-                df.to_sql('scraper_data', con=engine, if_exists='append', index=False)
-                logging.info(f"Added {len(df)} rows to scraper_data table")
-            else:
-                logging.info("No seat data to insert into database")
+            records = output.get('event_data') or []
+
+            def save_seat_data():
+                # Only insert to database if we have data
+                if df is not None and not df.empty:
+                    # Insert the records into the DB table 
+                    saved = write_scraper_data(engine, records, normalize=False)
+                    logging.info(f"Added {saved} rows to scraper_data table")
+                else:
+                    logging.info("No seat data to insert into database")
+
+            # send api call to orchestrator and insert seat data concurrently
+            outcomes = run_sinks({
+                "orchestrator": lambda: add_item_to_queue_with_bucket(output, process_name, bucket_name),
+                "scraper_data": save_seat_data,
+            })
+            for outcome in outcomes.values():
+                if not outcome["ok"]:
+                    raise outcome["error"]
 
             # Always update events_to_process regardless of seat data
-            metadata = MetaData()
-            metadata.reflect(bind=engine)
-            events_to_process = metadata.tables['events_to_process']
-
-            # Create the update statement
-            stmt = (
-                update(events_to_process)
-                .where(events_to_process.c.event_id == output.get('event_id'))
-                .values(is_being_processed=1)
-            )
-
-            # Execute the update
-            with engine.begin() as conn:
-                conn.execute(stmt)
+            mark_being_processed(engine, output.get('event_id'))
         else:
             error_msg = "Invalid process name"
             log_error_to_db(engine, venue_name, venue_id, event_name, skybox_event_id,
@@ -219,7 +217,3 @@ def lambda_handler(event, context):
             "body": json.dumps(error_payload),
             "headers": {"Content-Type": "application/json"},
         }
-    finally:
-        if engine:
-            engine.dispose()
-            logging.info("SQLAlchemy engine disposed.")
@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from read_config import ENV, bucket_name, s3_client
+
+logger = logging.getLogger(__name__)
+
+# Registry object in the config bucket: {venue name: {production name: [seatmap ids]}}
+REGISTRY_KEY = os.environ.get(
+    "KENNEDY_SEATMAP_REGISTRY_KEY",
+    "kennedy-seatmap-registry.json" if ENV == "production" else "kennedy-seatmap-registry-dev.json",
+)
+
+# How long a container trusts its copy before re-reading the object
+REGISTRY_REFRESH_SECONDS = int(os.environ.get("KENNEDY_SEATMAP_REGISTRY_REFRESH_SECONDS", 900))
+
+# Production key holding the seatmaps shared by every production in a hall
+ANY_PRODUCTION = "*"
+
+# Halls whose seatmaps do not change between productions
+DEFAULT_SEATMAPS: Dict[str, Dict[str, List[str]]] = {
+    "Kennedy Center Theater Lab": {ANY_PRODUCTION: ["8e3990a2-f3ac-475f-9f75-adcc96ef2c23"]},
+    "Kennedy Center Eisenhower Theater": {ANY_PRODUCTION: ["88c037f8-85d7-4b6f-ba75-c60daa4d152d", "b9ae6b48-4f04-4126-a696-dbb51b040282",
+                                                           "def92836-2a9e-4511-a465-eabef562a0c7"]},
+    "Kennedy Center Terrace Theater": {ANY_PRODUCTION: ["66b5111e-2ec6-4a79-8144-6a6f44ad43a5"]},
+    "Kennedy Center Family Theater": {ANY_PRODUCTION: ["76edbf0c-0afb-4626-80c9-987d5b7e8ae4"]},
+    "Kennedy Center Concert Hall": {ANY_PRODUCTION: ["beb3f28f-285f-4048-bcdb-8b7eff417e45", "6e31f4d0-134d-429d-ac3d-a08717148f68",
+                                                     "13caa55d-19b8-450c-a5b5-af0a939c099e", "08a3040b-f95e-4252-9fc6-a54277e7a20a"]},
+    "Kennedy Center Opera House": {ANY_PRODUCTION: ["768cf3c3-8d4a-499f-ab4b-b5a79d1fb552", "be589d78-31de-4744-af6b-ce116f4c86e1",
+                                                    "514c8046-0615-4811-8658-6bc967970a7f", "3ad65181-a52f-47f6-b6ef-a27c71d1b00d"]},
+}
+
+
+def production_key(event_name: str) -> str:
+    return " ".join((event_name or "").lower().split())
+
+
+class SeatmapRegistry:
+    """
+    Seatmap ids per venue and production, persisted as a JSON object in the
+    config bucket so that every container can skip the event-page download
+    for productions another scrape has already resolved.
+
+    Lookups check the production's own entry, then the venue-wide entry,
+    then DEFAULT_SEATMAPS. Storage errors are logged and never raised.
+    """
+
+    def __init__(self, client=s3_client, bucket: str = bucket_name, key: str = REGISTRY_KEY):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, List[str]]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def _read(self) -> Optional[Dict[str, Dict[str, List[str]]]]:
+        """The stored registry; {} if it does not exist yet, None if it could not be read."""
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.key)
+            return json.loads(response["Body"].read().decode("utf-8"))
+        except self.client.exceptions.NoSuchKey:
+            return {}
+        except Exception as e:
+            logger.warning(f"Could not read seatmap registry s3://{self.bucket}/{self.key}: {e}")
+            return None
+
+    def _entries_fresh(self) -> Dict[str, Dict[str, List[str]]]:
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > REGISTRY_REFRESH_SECONDS:
+                self._entries = self._read() or {}
+                self._loaded_at = time.monotonic()
+            return self._entries
+
+    def lookup(self, venue_name: str, event_name: str) -> Optional[List[str]]:
+        """Known seatmap ids for the production at the venue, or None."""
+        production = production_key(event_name)
+        for entries in (self._entries_fresh(), DEFAULT_SEATMAPS):
+            venue_entries = entries.get(venue_name, {})
+            seatmap_ids = venue_entries.get(production) or venue_entries.get(ANY_PRODUCTION)
+            if seatmap_ids:
+                return list(seatmap_ids)
+        return None
+
+    def remember(self, venue_name: str, event_name: str, seatmap_ids: List[str]) -> None:
+        """Store seatmap ids resolved from the event page."""
+        seatmap_ids = [seatmap_id for seatmap_id in seatmap_ids if seatmap_id]
+        if not seatmap_ids:
+            return
+        production = production_key(event_name)
+        with self._lock:
+            # Merge into the latest stored copy so entries written by other containers are kept
+            entries = self._read()
+            if entries is None:
+                self._entries.setdefault(venue_name, {})[production] = seatmap_ids
+                return
+            entries.setdefault(venue_name, {})[production] = seatmap_ids
+            self._entries = entries
+            self._loaded_at = time.monotonic()
+            try:
+                self.client.put_object(Bucket=self.bucket, Key=self.key, ContentType="application/json",
+                                       Body=json.dumps(entries, indent=2, sort_keys=True).encode("utf-8"))
+                logger.info(f"Registered {len(seatmap_ids)} seatmap ids for {venue_name} / {production}")
+            except Exception as e:
+                logger.warning(f"Could not write seatmap registry s3://{self.bucket}/{self.key}: {e}")
+
+
+seatmap_registry = SeatmapRegistry()
@@ -0,0 +1,94 @@
+import logging
+import re
+from typing import List, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_DATA_TABLE = "scraper_data"
+
+# Rows per executemany call; pymysql folds each call into multi-row INSERT ... VALUES statements
+INSERT_BATCH_ROWS = 1000
+
+_COLUMN_RE = re.compile(r"^\w+$")
+
+
+def normalize_seat_records(records: Sequence[dict]) -> pd.DataFrame:
+    """
+    Build a DataFrame from seat records and coerce the scraper_data column
+    types in one vectorized pass per column.
+    """
+    df = pd.DataFrame.from_records(records)
+
+    if "uniqueidentifier" in df.columns:
+        df = df.rename(columns={"uniqueidentifier": "unique_id"})
+
+    if "event_date" in df.columns:
+        df["event_date"] = pd.to_datetime(df["event_date"], format="%Y-%m-%d", errors="coerce")
+
+    if "event_time" in df.columns:
+        times = pd.to_datetime(df["event_time"].astype(str), format="%H:%M:%S", errors="coerce")
+        df["event_time"] = times.dt.strftime("%H:%M:%S").where(times.notna(), None)
+
+    if "price" in df.columns:
+        df["price"] = pd.to_numeric(df["price"], errors="coerce")
+
+    if "row" in df.columns:
+        df["row"] = df["row"].astype(str).str.replace(r"^Row:\s*", "", regex=True).str.strip()
+
+    if "seat_no" in df.columns:
+        df["seat_no"] = pd.to_numeric(df["seat_no"], errors="coerce").fillna(0).astype(int)
+
+    if "timestamp" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format="%d %b %Y %H:%M:%S", errors="coerce")
+        df["timestamp"] = df["timestamp"].fillna(pd.Timestamp.now())
+
+    return df
+
+
+def _column_values(series: pd.Series) -> List:
+    """Plain Python values for one column, with NaN/NaT mapped to None."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime("%Y-%m-%d" if series.name == "event_date" else "%Y-%m-%d %H:%M:%S")
+    values = series.tolist()
+    if series.isna().any():
+        values = [None if value is None or value != value else value for value in values]
+    return values
+
+
+def write_scraper_data(engine, records: Sequence[dict], normalize: bool = True) -> int:
+    """
+    Insert seat records into scraper_data in one transaction and return the
+    number of rows written.
+
+    Records are passed straight from the handler (no JSON round trip) and
+    inserted with executemany, which pymysql sends as multi-row VALUES
+    statements instead of going through DataFrame.to_sql.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        records: Seat dicts keyed by scraper_data column names
+        normalize: Apply normalize_seat_records' type coercion first
+    """
+    if not records:
+        return 0
+
+    df = normalize_seat_records(records) if normalize else pd.DataFrame.from_records(records)
+    columns = list(df.columns)
+    bad = [column for column in columns if not _COLUMN_RE.match(str(column))]
+    if bad:
+        raise ValueError(f"Unsupported scraper_data column names: {bad}")
+
+    sql = (
+        f"INSERT INTO {SCRAPER_DATA_TABLE} ({', '.join(f'`{column}`' for column in columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    rows = list(zip(*(_column_values(df[column]) for column in columns)))
+
+    with engine.begin() as conn:
+        for start in range(0, len(rows), INSERT_BATCH_ROWS):
+            conn.exec_driver_sql(sql, rows[start:start + INSERT_BATCH_ROWS])
+
+    logger.info("[write_scraper_data] Inserted %d rows into %s", len(rows), SCRAPER_DATA_TABLE)
+    return len(rows)